@@ -0,0 +1,195 @@
+"""
+BIXOLON 라벨 렌더링 벤치마크
+프린터 없이(Linux 포함) 라벨 생성 경로의 실행 시간을 측정하고 기준값과 비교합니다.
+
+사용법:
+    python bench_label.py                       # 측정 결과 출력
+    python bench_label.py --save-baseline       # 결과를 기준값으로 저장
+    python bench_label.py --compare             # 기준값 대비 회귀 확인 (회귀 시 종료 코드 1)
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import bixolon_label_printer_v2 as app
+
+
+BASELINE_FILE = 'bench_baseline.json'
+
+# 측정 케이스 (이름, 라벨 데이터)
+CASES = [
+    ('short_name', {
+        'qr_data': 'Z000000001089',
+        'name': '정윤정',
+        'employee_id': 'Z00000000108',
+        'department': '싸이버원',
+        'issue_date': '2025-10-27',
+    }),
+    ('long_name', {
+        'qr_data': 'Z000000001090',
+        'name': '남궁민수 알렉산더 크리스토퍼',
+        'employee_id': 'Z00000000109',
+        'department': '싸이버원',
+        'issue_date': '2025-10-27',
+    }),
+    ('long_department', {
+        'qr_data': 'Z000000001091',
+        'name': '강동원',
+        'employee_id': 'Z00000000109',
+        'department': '응급의학과 중환자실 간호부 야간 근무조 2팀',
+        'issue_date': '2025-10-27',
+    }),
+    ('qr_64', {
+        'qr_data': 'Z' * 64,
+        'name': '홍길동',
+        'employee_id': 'T00000000108',
+        'department': '싸이버원',
+        'issue_date': '2025-10-27',
+    }),
+    ('qr_256', {
+        'qr_data': 'https://example.org/tag?id=' + '0123456789' * 23,
+        'name': '홍길동',
+        'employee_id': 'T00000000108',
+        'department': '싸이버원',
+        'issue_date': '2025-10-27',
+    }),
+]
+
+
+def load_config():
+    """conf/config.json (템플릿/폰트 설정 사용, 없으면 기본값)"""
+    try:
+        with open('conf/config.json', 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def create_printer(cache=False):
+    """벤치마크용 프린터 (가짜 스풀러, 캐시 사용 여부 선택)"""
+    config = load_config()
+    config['printer'] = dict(config.get('printer', {}), spooler='fake', backend='gdi')
+    if not cache:
+        config['cache'] = {'max_entries': 0, 'qr_matrices': 0}
+    return app.BixolonLabelPrinter('benchmark', config)
+
+
+def measure(func, iterations, warmup=3):
+    """func 실행 시간 (초 단위 표본 목록)"""
+    for _ in range(warmup):
+        func()
+
+    gc.collect()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        'median_ms': statistics.median(ordered) * 1000,
+        'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+    }
+
+
+def run_benchmarks(iterations):
+    """전체 벤치마크 실행 → {벤치마크 이름: 결과}"""
+    results = {}
+    printer = create_printer(cache=False)
+    cached_printer = create_printer(cache=True)
+
+    # 폰트 로드 (프로세스 캐시를 비우고 최초 로드 비용 측정)
+    def load_fonts():
+        app.FontRegistry.fonts.clear()
+        app.FontRegistry.load_times.clear()
+        app.FontRegistry(printer.config.get('printer', {}).get('font_path')).get(24)
+    results['font_load'] = summarize(measure(load_fonts, max(5, iterations // 10)))
+
+    for name, data in CASES:
+        results[f'qr/{name}'] = summarize(measure(
+            lambda: printer.create_qr_code(data['qr_data'], size=printer.template.qr_size), iterations))
+        results[f'label_image/{name}'] = summarize(measure(
+            lambda: printer.create_label_image(data), iterations))
+        results[f'render/{name}'] = summarize(measure(
+            lambda: printer.render_label(data), iterations))
+        results[f'reprint_cached/{name}'] = summarize(measure(
+            lambda: cached_printer.render_label(data), iterations))
+
+    return results
+
+
+def print_results(results, baseline=None, threshold=0.2, min_delta_ms=0.2):
+    """결과 표 출력 → 회귀 항목 목록 (증가율과 절대 증가량을 모두 넘어야 회귀)"""
+    regressions = []
+    print(f"{'benchmark':<32} {'median ms':>10} {'p95 ms':>10}  baseline")
+    print("-" * 69)
+    for name, result in results.items():
+        note = ''
+        if baseline and name in baseline:
+            base = baseline[name]['median_ms']
+            change = (result['median_ms'] - base) / base if base else 0.0
+            note = f"{change * 100:+.1f}%"
+            if change > threshold and result['median_ms'] - base > min_delta_ms:
+                note += '  ← 회귀'
+                regressions.append(name)
+        print(f"{name:<32} {result['median_ms']:>10.3f} {result['p95_ms']:>10.3f}  {note}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='BIXOLON 라벨 렌더링 벤치마크')
+    parser.add_argument('-n', '--iterations', type=int, default=50, help='케이스별 반복 횟수')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='기준값 파일')
+    parser.add_argument('--save-baseline', action='store_true', help='결과를 기준값으로 저장')
+    parser.add_argument('--compare', action='store_true', help='기준값과 비교해 회귀 시 실패')
+    parser.add_argument('--threshold', type=float, default=0.2, help='회귀 판단 기준 (중앙값 증가율, 기본 20%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=0.2, help='회귀로 보지 않을 최소 증가량 (ms, 측정 잡음 무시)')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"BIXOLON 라벨 렌더링 벤치마크 ({platform.python_implementation()} {platform.python_version()}, {platform.system()})")
+    print("=" * 80)
+
+    results = run_benchmarks(args.iterations)
+
+    baseline = None
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"✗ 기준값 파일이 없습니다: {args.baseline}")
+            return 2
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    regressions = print_results(results, baseline, args.threshold, args.min_delta_ms)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'iterations': args.iterations,
+                'results': results,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\n✓ 기준값 저장: {args.baseline}")
+
+    if regressions:
+        print(f"\n✗ 회귀 {len(regressions)}건: {', '.join(regressions)}")
+        return 1
+    if baseline:
+        print("\n✓ 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,564 @@
+"""
+BIXOLON 라벨 프린터 - 화면 구성 (트레이 아이콘 / 인쇄 다이얼로그 / 상태 다이얼로그)
+헤드리스 모드에서는 이 모듈을 불러오지 않으므로 PyQt5/pystray가 로드되지 않습니다.
+"""
+
+import os
+import sys
+import threading
+from collections import deque
+
+from PIL import Image, ImageDraw
+
+# 시스템 트레이
+import pystray
+from pystray import MenuItem as item
+
+# GUI
+from PyQt5.QtWidgets import QApplication, QDialog, QVBoxLayout, QLabel, QProgressBar, QPushButton
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QObject
+from PyQt5.QtGui import QCursor
+
+
+class PrintingDialog(QDialog):
+    """인쇄 중 애니메이션 다이얼로그 - 글래스모피즘 디자인"""
+    
+    def __init__(self, min_status_ms=300):
+        super().__init__()
+        self.min_status_ms = min_status_ms
+        self.setWindowTitle("국립소방병원 TAG 발급 프린터 실행중 ... ")
+        self.setFixedSize(400, 250)
+        self.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint)
+        self.setAttribute(Qt.WA_TranslucentBackground)  # 투명 배경
+        
+        # 메인 레이아웃
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(0, 0, 0, 0)
+        
+        # 글래스 컨테이너
+        self.glass_container = QLabel()
+        self.glass_container.setFixedSize(400, 250)
+        self.glass_container.setStyleSheet("""
+            QLabel {
+                background: qlineargradient(
+                    x1:0, y1:0, x2:1, y2:1,
+                    stop:0 rgba(255, 255, 255, 0.25),
+                    stop:1 rgba(255, 255, 255, 0.15)
+                );
+                border: 2px solid rgba(255, 255, 255, 0.3);
+                border-radius: 25px;
+            }
+        """)
+        
+        # 컨테이너 내부 레이아웃
+        container_layout = QVBoxLayout(self.glass_container)
+        container_layout.setContentsMargins(30, 30, 30, 30)
+        container_layout.setSpacing(20)
+        
+        # 상단 여백
+        container_layout.addStretch()
+        
+        # 아이콘 레이블
+        self.icon_label = QLabel("🖨️")
+        self.icon_label.setAlignment(Qt.AlignCenter)
+        self.icon_label.setStyleSheet("""
+            QLabel {
+                font-size: 48px;
+                background: transparent;
+                border: none;
+            }
+        """)
+        container_layout.addWidget(self.icon_label)
+        
+        # 상태 레이블
+        self.status_label = QLabel("인쇄 준비 중...")
+        self.status_label.setAlignment(Qt.AlignCenter)
+        self.status_style = """
+            QLabel {
+                color: rgba(255, 255, 255, 1);
+                font-size: 18px;
+                font-weight: bold;
+                background: transparent;
+                border: none;
+                text-shadow: 0 2px 4px rgba(0, 0, 0, 0.3);
+            }
+        """
+        self.status_label.setStyleSheet(self.status_style)
+        container_layout.addWidget(self.status_label)
+        
+        # 프로그레스 바
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)  # 무한 애니메이션
+        self.progress_bar.setFixedHeight(8)
+        self.progress_bar.setTextVisible(False)
+        self.progress_style = """
+            QProgressBar {
+                background: rgba(255, 255, 255, 0.2);
+                border: none;
+                border-radius: 4px;
+            }
+            QProgressBar::chunk {
+                background: qlineargradient(
+                    x1:0, y1:0, x2:1, y2:0,
+                    stop:0 rgba(100, 200, 255, 0.8),
+                    stop:0.5 rgba(150, 220, 255, 1),
+                    stop:1 rgba(100, 200, 255, 0.8)
+                );
+                border-radius: 4px;
+            }
+        """
+        self.progress_bar.setStyleSheet(self.progress_style)
+        container_layout.addWidget(self.progress_bar)
+        
+        # 세부 정보 레이블
+        self.detail_label = QLabel("")
+        self.detail_label.setAlignment(Qt.AlignCenter)
+        self.detail_label.setStyleSheet("""
+            QLabel {
+                color: rgba(255, 255, 255, 0.8);
+                font-size: 12px;
+                background: transparent;
+                border: none;
+            }
+        """)
+        container_layout.addWidget(self.detail_label)
+        
+        # 하단 여백
+        container_layout.addStretch()
+        
+        main_layout.addWidget(self.glass_container)
+        self.setLayout(main_layout)
+        
+        # 화면 중앙에 배치
+        self.center_on_screen()
+        
+        # 자동 닫기 타이머
+        self.close_timer = QTimer()
+        self.close_timer.timeout.connect(self.close)
+        
+        # 애니메이션 타이머
+        self.animation_timer = QTimer()
+        self.animation_timer.timeout.connect(self.animate_icon)
+        self.animation_step = 0
+        self.animation_timer.start(300)  # 300ms마다 아이콘 변경
+        
+        # 상태 표시 타이머 (각 상태 문구의 최소 표시 시간 보장)
+        self.pending_status = deque()
+        self.pending_close_delay = None
+        self.status_timer = QTimer()
+        self.status_timer.setSingleShot(True)
+        self.status_timer.timeout.connect(self.show_next_status)
+    
+    def reset(self):
+        """새 인쇄 작업을 위해 초기 상태로 되돌림"""
+        self.close_timer.stop()
+        self.status_timer.stop()
+        self.pending_status.clear()
+        self.pending_close_delay = None
+        self.icon_label.setText("🖨️")
+        self.status_label.setStyleSheet(self.status_style)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setStyleSheet(self.progress_style)
+        if not self.animation_timer.isActive():
+            self.animation_timer.start(300)
+    
+    def center_on_screen(self):
+        """화면 중앙에 다이얼로그 배치"""
+        screen = QApplication.desktop().screenGeometry()
+        x = (screen.width() - self.width()) // 2
+        y = (screen.height() - self.height()) // 2
+        self.move(x, y)
+    
+    def animate_icon(self):
+        """아이콘 애니메이션"""
+        icons = ["🖨️", "📄", "✨", "🖨️"]
+        self.icon_label.setText(icons[self.animation_step % len(icons)])
+        self.animation_step += 1
+    
+    def update_status(self, status_text):
+        """상태 업데이트 (이전 상태가 최소 시간만큼 표시된 뒤 반영)"""
+        self.pending_status.append(status_text)
+        if not self.status_timer.isActive():
+            self.show_next_status()
+    
+    def show_next_status(self):
+        """대기 중인 다음 상태 표시"""
+        if self.pending_status:
+            self.status_label.setText(self.pending_status.popleft())
+            self.status_timer.start(self.min_status_ms)
+        elif self.pending_close_delay is not None:
+            delay = self.pending_close_delay
+            self.pending_close_delay = None
+            self.finish_and_close(delay)
+    
+    def update_detail(self, detail_text):
+        """세부 정보 업데이트"""
+        self.detail_label.setText(detail_text)
+    
+    def finish_and_close(self, delay=2000):
+        """인쇄 완료 후 자동 닫기"""
+        # 아직 표시할 상태가 남아 있으면 모두 보여준 뒤 완료 처리
+        if self.pending_status or self.status_timer.isActive():
+            self.pending_close_delay = delay
+            return
+        
+        self.animation_timer.stop()
+        self.icon_label.setText("✅")
+        self.status_label.setText("인쇄 완료!")
+        self.status_label.setStyleSheet("""
+            QLabel {
+                color: rgba(100, 255, 150, 1);
+                font-size: 18px;
+                font-weight: bold;
+                background: transparent;
+                border: none;
+                text-shadow: 0 2px 8px rgba(100, 255, 150, 0.5);
+            }
+        """)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(100)
+        self.progress_bar.setStyleSheet("""
+            QProgressBar {
+                background: rgba(255, 255, 255, 0.2);
+                border: none;
+                border-radius: 4px;
+            }
+            QProgressBar::chunk {
+                background: qlineargradient(
+                    x1:0, y1:0, x2:1, y2:0,
+                    stop:0 rgba(100, 255, 150, 0.8),
+                    stop:0.5 rgba(150, 255, 180, 1),
+                    stop:1 rgba(100, 255, 150, 0.8)
+                );
+                border-radius: 4px;
+            }
+        """)
+        self.close_timer.start(delay)
+
+
+class TrayIcon:
+    """시스템 트레이 아이콘"""
+    
+    TITLE = "국립소방병원 TAG 발급 프린터"
+    
+    def __init__(self, server, app):
+        self.server = server
+        self.app = app
+        self.icon = None
+        
+    def create_image(self):
+        """트레이 아이콘 이미지 생성"""
+        try:
+            # img/logo.ico 파일 사용
+            if os.path.exists('img/logo.ico'):
+                image = Image.open('img/logo.ico')
+                # ICO 파일은 여러 크기를 포함할 수 있으므로 적절한 크기로 조정
+                if image.size != (64, 64):
+                    image = image.resize((64, 64), Image.Resampling.LANCZOS)
+                return image
+            else:
+                # 파일이 없으면 기본 아이콘 생성
+                print("⚠️ img/logo.ico 파일을 찾을 수 없습니다. 기본 아이콘을 사용합니다.")
+                return self.create_default_icon()
+        except Exception as e:
+            print(f"⚠️ 아이콘 로드 오류: {e}. 기본 아이콘을 사용합니다.")
+            return self.create_default_icon()
+
+    def create_default_icon(self):
+        """기본 아이콘 생성 (로고 파일이 없을 때)"""
+        width = 64
+        height = 64
+        image = Image.new('RGB', (width, height), 'white')
+        dc = ImageDraw.Draw(image)
+        
+        # 간단한 프린터 아이콘
+        dc.rectangle([10, 15, 54, 40], fill='#0078D4', outline='black', width=2)
+        dc.rectangle([15, 20, 49, 35], fill='white', outline='black')
+        dc.rectangle([20, 40, 44, 50], fill='white', outline='black', width=1)
+        dc.line([25, 43, 39, 43], fill='green', width=2)
+        dc.line([25, 46, 39, 46], fill='green', width=2)
+        
+        return image
+    
+    def on_quit(self, icon, item):
+        """종료 메뉴"""
+        print("👋 프로그램 종료 중...")
+        self.app.service.shutdown()
+        icon.stop()
+        QApplication.quit()
+    
+    def update_health(self, health):
+        """툴팁에 프린터 상태 표시"""
+        if self.icon is not None:
+            self.icon.title = f"{self.TITLE}\n프린터: {health}"
+    
+    def on_status(self, icon, item):
+        """상태 확인"""
+        print(f"✓ 프린터 상태: {self.app.service.health_summary()}")
+        print(f"   서버: {self.server.host}:{self.server.port}")
+        print(f"   프린터: {self.server.printer.printer_name}")
+        
+        # 시그널 발생
+        self.app.status_signal.emit()
+    
+    def run(self):
+        """트레이 아이콘 실행"""
+        menu = (
+            item('상태 확인', self.on_status),
+            item('종료', self.on_quit)
+        )
+        
+        self.icon = pystray.Icon(
+            "bixolon_printer",
+            self.create_image(),
+            f"{self.TITLE}\n실행 중...",
+            menu
+        )
+        
+        print("📌 시스템 트레이 아이콘 생성됨")
+        self.icon.run()
+
+class StatusDialog(QDialog):
+    """상태 확인 다이얼로그 - 글래스모피즘 디자인"""
+    
+    def __init__(self, server_info):
+        super().__init__()
+        self.setWindowTitle("프린터 상태")
+        
+        # 추가 정보 (처리량/지연 시간 등) 줄 수만큼 높이 확장
+        details = server_info.get('details', [])
+        height = 350 + 32 * len(details)
+        self.setFixedSize(450, height)
+        self.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        
+        # 메인 레이아웃
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(0, 0, 0, 0)
+        
+        # 글래스 컨테이너
+        self.glass_container = QLabel()
+        self.glass_container.setFixedSize(450, height)
+        self.glass_container.setStyleSheet("""
+            QLabel {
+                background: qlineargradient(
+                    x1:0, y1:0, x2:1, y2:1,
+                    stop:0 rgba(0, 0, 0, 0.75),
+                    stop:1 rgba(0, 0, 0, 0.85)
+                );
+                border: 2px solid rgba(242, 98, 29, 0.75);
+                border-radius: 25px;
+            }
+        """)
+        
+        # 컨테이너 내부 레이아웃
+        container_layout = QVBoxLayout(self.glass_container)
+        container_layout.setContentsMargins(30, 30, 30, 30)
+        container_layout.setSpacing(20)
+        
+        # 제목
+        title_label = QLabel("🖨️ 프린터 상태")
+        title_label.setAlignment(Qt.AlignCenter)
+        title_label.setStyleSheet("""
+            QLabel {
+                color: rgba(255, 255, 255, 1);
+                font-size: 24px;
+                font-weight: bold;
+                background: transparent;
+                border: none;
+            }
+        """)
+        container_layout.addWidget(title_label)
+        
+        # 구분선
+        line = QLabel()
+        line.setFixedHeight(2)
+        line.setStyleSheet("""
+            QLabel {
+                background: rgba(242, 98, 29, 0.5);
+                border: none;
+            }
+        """)
+        container_layout.addWidget(line)
+        
+        detail_text = "".join(
+            f"""
+            <p style='font-size: 14px; margin: 5px 0;'>
+                <b>{title}:</b> {value}
+            </p>"""
+            for title, value in details
+        )
+        
+        # 상태 정보 부분을 이렇게 수정
+        status_text = f"""
+        <div style='color: rgba(255, 255, 255, 0.98); line-height: 1.3;'>
+            <p style='font-size: 16px; margin: 5px 0;'>
+                <b>{'🟢' if server_info['ready'] else '🔴'} 상태:</b> {server_info['status']}
+            </p>
+            <p style='font-size: 16px; margin: 5px 0;'>
+                <b>🌐 서버:</b> {server_info['host']}:{server_info['port']}
+            </p>
+            <p style='font-size: 16px; margin: 5px 0;'>
+                <b>🖨️ 프린터:</b> {server_info['printer']}
+            </p>
+            <p style='font-size: 16px; margin: 5px 0;'>
+                <b>📂 로그:</b> logs/ 폴더
+            </p>{detail_text}
+        </div>
+        """
+        
+        info_label = QLabel(status_text)
+        info_label.setWordWrap(True)  # 자동 줄바꿈
+        info_label.setTextFormat(Qt.RichText)  # ← 이거 추가!
+        info_label.setStyleSheet("""
+            QLabel {
+                background: transparent;
+                border: none;
+                padding: 10px;
+            }
+        """)
+        container_layout.addWidget(info_label)
+        
+        container_layout.addStretch()
+        
+        # 닫기 버튼
+        close_btn = QPushButton("닫기")
+        close_btn.setFixedHeight(45)
+        close_btn.setCursor(Qt.PointingHandCursor)
+        close_btn.setStyleSheet("""
+            QPushButton {
+                background: rgba(242, 98, 29, 0.2);
+                color: white;
+                border: 2px solid rgba(242, 98, 29, 0.3);
+                border-radius: 10px;
+                font-size: 16px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background: rgba(242, 98, 29, 0.6);
+                border: 2px solid rgba(242, 98, 29, 0.5);
+            }
+            QPushButton:pressed {
+                background: rgba(242, 98, 29, 0.7);
+            }
+        """)
+        close_btn.clicked.connect(self.hide)
+        container_layout.addWidget(close_btn)
+        
+        main_layout.addWidget(self.glass_container)
+        self.setLayout(main_layout)
+        
+        # 화면 중앙에 배치
+        self.center_on_screen()
+        
+    def close_dialog(self):
+        """다이얼로그 닫기"""
+        self.hide()
+        self.deleteLater()
+    
+    def center_on_screen(self):
+        """화면 중앙에 다이얼로그 배치"""
+        screen = QApplication.desktop().screenGeometry()
+        x = (screen.width() - self.width()) // 2
+        y = (screen.height() - self.height()) // 2
+        self.move(x, y)
+
+
+class GuiApplication(QObject):
+    """화면 구성 (Qt 이벤트 루프 + 트레이 아이콘 + 인쇄 다이얼로그)"""
+    
+    status_signal = pyqtSignal()  # ← 클래스 변수로!
+    
+    def __init__(self, service):
+        super().__init__()
+        self.service = service
+        
+        # Qt 애플리케이션
+        self.app = QApplication(sys.argv)
+        self.app.setQuitOnLastWindowClosed(False)
+        
+        self.tray = TrayIcon(service.server, self)
+        self.dialog = None
+        
+        # 인쇄 상태 이벤트 처리 (UI 스레드에서 주기적으로 꺼내 반영)
+        self.print_event_handlers = {
+            'start_printing': self.show_printing_dialog,
+            'finish_printing': self.hide_printing_dialog,
+            'update_status': self.update_dialog_status,
+        }
+        self.print_event_timer = QTimer()
+        self.print_event_timer.timeout.connect(self.dispatch_print_events)
+        self.print_event_timer.start(50)
+        
+        self.status_signal.connect(self._show_status_dialog)  # ← 상태 시그널
+        
+        # 프린터 상태를 트레이 툴팁에 반영 (상태 감시 결과는 캐시되어 있어 바로 읽음)
+        self.health = None
+        self.health_timer = QTimer()
+        self.health_timer.timeout.connect(self.update_health)
+        self.health_timer.start(1000)
+    
+    @property
+    def config(self):
+        """현재 설정 (설정 파일을 다시 읽으면 바로 반영)"""
+        return self.service.config
+    
+    def dispatch_print_events(self):
+        """인쇄 경로에서 쌓인 상태 이벤트를 다이얼로그에 반영"""
+        for name, args in self.service.printer.signals.drain():
+            self.print_event_handlers[name](*args)
+    
+    def update_health(self):
+        """프린터 상태가 바뀌었으면 트레이 툴팁 갱신"""
+        health = self.service.health_summary()
+        if health != self.health and self.tray.icon is not None:
+            self.health = health
+            self.tray.update_health(health)
+    
+    def _show_status_dialog(self):
+        """실제 다이얼로그 표시 (메인 스레드)"""
+        health = self.service.health_summary()
+        server_info = {
+            'status': f"실행 중 · 프린터 {health}",
+            'ready': health in ("정상", "확인 안 함"),
+            'host': self.service.server.host,
+            'port': self.service.server.port,
+            'printer': self.service.printer.printer_name,
+            'details': self.service.status_details()
+        }
+        dialog = StatusDialog(server_info)
+        dialog.exec_()
+    
+    def show_printing_dialog(self):
+        """인쇄 다이얼로그 표시"""
+        min_status_ms = self.config.get('dialog', {}).get('min_status_ms', 300)
+        if self.dialog is None:
+            self.dialog = PrintingDialog(min_status_ms=min_status_ms)
+        self.dialog.min_status_ms = min_status_ms
+        self.dialog.reset()
+        self.dialog.show()
+        self.dialog.update_status("🖨️ 인쇄 중...")
+    
+    def hide_printing_dialog(self):
+        """인쇄 다이얼로그 숨김"""
+        if self.dialog:
+            delay = self.config.get('dialog', {}).get('auto_close_delay', 2000)
+            self.dialog.finish_and_close(delay=delay)
+    
+    def update_dialog_status(self, status):
+        """다이얼로그 상태 업데이트"""
+        if self.dialog:
+            self.dialog.update_status(status)
+    
+    def run(self):
+        """트레이 아이콘 + Qt 이벤트 루프 실행 (종료 코드 반환)"""
+        tray_thread = threading.Thread(target=self.tray.run)
+        tray_thread.daemon = True
+        tray_thread.start()
+        
+        print("✓ 프로그램이 시작되었습니다.")
+        print("✓ 시스템 트레이에서 확인할 수 있습니다.")
+        print("✓ 종료하려면 트레이 아이콘을 우클릭하세요.")
+        print("=" * 60)
+        
+        return self.app.exec_()
@@ -4,795 +4,3430 @@ BIXOLON XD5-40d 라벨 프린터 - 한글 폰트 지원 버전
 
 import socket
 import json
+import asyncio
 import threading
 import time
 import sys
 import io
 import os
+import queue
+import atexit
+import hashlib
+import urllib.parse
+import urllib.request
+import ipaddress
 import logging
-from datetime import datetime
+import signal
+import sqlite3
+import multiprocessing
+import uuid
+import argparse
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import datetime, timedelta
+from logging.handlers import QueueHandler, QueueListener
 
-# QR 코드 생성
-import qrcode
+# 이미지 생성 (QR 코드 qrcode는 첫 QR 생성 시 로드)
 from PIL import Image, ImageDraw, ImageFont
 
-# 시스템 트레이
-import pystray
-from pystray import MenuItem as item
+# GUI(PyQt5/pystray)는 bixolon_gui, Windows 프린터(pywin32)는 Win32SpoolerApi에서
+# 실제로 필요할 때만 불러온다 (헤드리스 모드의 시작 시간/메모리 절감)
 
-# GUI
-from PyQt5.QtWidgets import QApplication, QDialog, QVBoxLayout, QLabel, QProgressBar, QPushButton
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QObject
-from PyQt5.QtGui import QCursor
 
-# Windows 프린터
-try:
-    import win32print
-    import win32ui
-    from PIL import ImageWin
-except ImportError:
-    print("Windows 환경이 아닙니다. pywin32가 필요합니다.")
+class StatusSignal:
+    """상태 시그널 - 이벤트를 버퍼에 넣고 즉시 반환 (fire-and-forget)"""
+    
+    def __init__(self, name, events):
+        self.name = name
+        self.events = events
+    
+    def emit(self, *args):
+        """이벤트 등록 (인쇄 경로를 절대 막지 않음)"""
+        self.events.append((self.name, args))
+
+
+class PrintSignals:
+    """인쇄 상태 시그널
+    
+    인쇄 경로는 이벤트를 버퍼에 적재만 하고, UI 쪽이 주기적으로 꺼내 처리한다.
+    UI가 없거나 느리면 오래된 이벤트부터 버려진다.
+    """
+    
+    def __init__(self, max_events=256):
+        self.events = deque(maxlen=max_events)
+        self.start_printing = StatusSignal('start_printing', self.events)
+        self.finish_printing = StatusSignal('finish_printing', self.events)
+        self.update_status = StatusSignal('update_status', self.events)
+    
+    def drain(self):
+        """쌓인 이벤트를 순서대로 꺼냄"""
+        while True:
+            try:
+                yield self.events.popleft()
+            except IndexError:
+                return
+
+
+# 1비트 패킹 비트맵 (행 단위 바이트 정렬, PIL '1' 모드 규칙: 1=흰색)
+PackedBitmap = namedtuple('PackedBitmap', 'width height data')
+
+# 비트 반전 테이블 (BPL-Z 그래픽은 1=검정)
+INVERT_TABLE = bytes(255 - i for i in range(256))
+
+
+def pack_bitmap(img):
+    """라벨 이미지 → 패킹 비트맵 (이진화는 여기서 한 번만)"""
+    if img.mode != '1':
+        img = img.convert('1', dither=Image.Dither.NONE)
+    return PackedBitmap(img.width, img.height, img.tobytes())
+
 
+# 프린터 상태 (ready: 출력 가능 여부, state: 상태 코드, detail: 부가 정보)
+PrinterStatus = namedtuple('PrinterStatus', 'ready state detail')
 
-class PrintSignals(QObject):
-    """인쇄 상태 시그널"""
-    start_printing = pyqtSignal()
-    finish_printing = pyqtSignal()
-    update_status = pyqtSignal(str)
+# 스풀러 상태 플래그 (GetPrinter 레벨 2 Status) → 상태 코드, 먼저 일치하는 것 사용
+PRINTER_STATUS_FLAGS = [
+    (0x00000080, 'offline'),       # PRINTER_STATUS_OFFLINE
+    (0x00001000, 'offline'),       # PRINTER_STATUS_NOT_AVAILABLE
+    (0x00000008, 'paper_jam'),     # PRINTER_STATUS_PAPER_JAM
+    (0x00000010, 'paper_out'),     # PRINTER_STATUS_PAPER_OUT
+    (0x00000040, 'paper_problem'), # PRINTER_STATUS_PAPER_PROBLEM
+    (0x00400000, 'door_open'),     # PRINTER_STATUS_DOOR_OPEN
+    (0x00000001, 'paused'),        # PRINTER_STATUS_PAUSED
+    (0x00100000, 'error'),         # PRINTER_STATUS_USER_INTERVENTION
+    (0x00000002, 'error'),         # PRINTER_STATUS_ERROR
+]
+PRINTER_ATTRIBUTE_WORK_OFFLINE = 0x00000400
 
+# 상태 코드 → 화면 표시
+PRINTER_STATE_TEXT = {
+    'ready': '정상',
+    'offline': '오프라인',
+    'paper_jam': '용지 걸림',
+    'paper_out': '라벨 없음',
+    'paper_problem': '용지 문제',
+    'door_open': '덮개 열림',
+    'paused': '일시 중지',
+    'error': '오류',
+    'unknown': '확인 중',
+}
 
-class PrintingDialog(QDialog):
-    """인쇄 중 애니메이션 다이얼로그 - 글래스모피즘 디자인"""
+
+def status_from_flags(status, attributes=0, jobs=0):
+    """스풀러 상태 플래그 → PrinterStatus"""
+    detail = f"대기 문서 {jobs}건"
+    if attributes & PRINTER_ATTRIBUTE_WORK_OFFLINE:
+        return PrinterStatus(False, 'offline', detail)
+    for flag, state in PRINTER_STATUS_FLAGS:
+        if status & flag:
+            return PrinterStatus(False, state, detail)
+    return PrinterStatus(True, 'ready', detail)
+
+
+class Win32SpoolerApi:
+    """Windows 스풀러 호출 (win32print / win32ui)
+    
+    pywin32는 실제 스풀러를 쓰는 세션이 만들어질 때 처음 불러온다.
+    """
     
     def __init__(self):
-        super().__init__()
-        self.setWindowTitle("국립소방병원 TAG 발급 프린터 실행중 ... ")
-        self.setFixedSize(400, 250)
-        self.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint)
-        self.setAttribute(Qt.WA_TranslucentBackground)  # 투명 배경
-        
-        # 메인 레이아웃
-        main_layout = QVBoxLayout()
-        main_layout.setContentsMargins(0, 0, 0, 0)
-        
-        # 글래스 컨테이너
-        self.glass_container = QLabel()
-        self.glass_container.setFixedSize(400, 250)
-        self.glass_container.setStyleSheet("""
-            QLabel {
-                background: qlineargradient(
-                    x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(255, 255, 255, 0.25),
-                    stop:1 rgba(255, 255, 255, 0.15)
-                );
-                border: 2px solid rgba(255, 255, 255, 0.3);
-                border-radius: 25px;
-            }
-        """)
-        
-        # 컨테이너 내부 레이아웃
-        container_layout = QVBoxLayout(self.glass_container)
-        container_layout.setContentsMargins(30, 30, 30, 30)
-        container_layout.setSpacing(20)
-        
-        # 상단 여백
-        container_layout.addStretch()
-        
-        # 아이콘 레이블
-        self.icon_label = QLabel("🖨️")
-        self.icon_label.setAlignment(Qt.AlignCenter)
-        self.icon_label.setStyleSheet("""
-            QLabel {
-                font-size: 48px;
-                background: transparent;
-                border: none;
-            }
-        """)
-        container_layout.addWidget(self.icon_label)
-        
-        # 상태 레이블
-        self.status_label = QLabel("인쇄 준비 중...")
-        self.status_label.setAlignment(Qt.AlignCenter)
-        self.status_label.setStyleSheet("""
-            QLabel {
-                color: rgba(255, 255, 255, 1);
-                font-size: 18px;
-                font-weight: bold;
-                background: transparent;
-                border: none;
-                text-shadow: 0 2px 4px rgba(0, 0, 0, 0.3);
-            }
-        """)
-        container_layout.addWidget(self.status_label)
-        
-        # 프로그레스 바
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setRange(0, 0)  # 무한 애니메이션
-        self.progress_bar.setFixedHeight(8)
-        self.progress_bar.setTextVisible(False)
-        self.progress_bar.setStyleSheet("""
-            QProgressBar {
-                background: rgba(255, 255, 255, 0.2);
-                border: none;
-                border-radius: 4px;
-            }
-            QProgressBar::chunk {
-                background: qlineargradient(
-                    x1:0, y1:0, x2:1, y2:0,
-                    stop:0 rgba(100, 200, 255, 0.8),
-                    stop:0.5 rgba(150, 220, 255, 1),
-                    stop:1 rgba(100, 200, 255, 0.8)
-                );
-                border-radius: 4px;
-            }
-        """)
-        container_layout.addWidget(self.progress_bar)
-        
-        # 세부 정보 레이블
-        self.detail_label = QLabel("")
-        self.detail_label.setAlignment(Qt.AlignCenter)
-        self.detail_label.setStyleSheet("""
-            QLabel {
-                color: rgba(255, 255, 255, 0.8);
-                font-size: 12px;
-                background: transparent;
-                border: none;
-            }
-        """)
-        container_layout.addWidget(self.detail_label)
-        
-        # 하단 여백
-        container_layout.addStretch()
-        
-        main_layout.addWidget(self.glass_container)
-        self.setLayout(main_layout)
-        
-        # 화면 중앙에 배치
-        self.center_on_screen()
-        
-        # 자동 닫기 타이머
-        self.close_timer = QTimer()
-        self.close_timer.timeout.connect(self.close)
-        
-        # 애니메이션 타이머
-        self.animation_timer = QTimer()
-        self.animation_timer.timeout.connect(self.animate_icon)
-        self.animation_step = 0
-        self.animation_timer.start(300)  # 300ms마다 아이콘 변경
-    
-    def center_on_screen(self):
-        """화면 중앙에 다이얼로그 배치"""
-        screen = QApplication.desktop().screenGeometry()
-        x = (screen.width() - self.width()) // 2
-        y = (screen.height() - self.height()) // 2
-        self.move(x, y)
-    
-    def animate_icon(self):
-        """아이콘 애니메이션"""
-        icons = ["🖨️", "📄", "✨", "🖨️"]
-        self.icon_label.setText(icons[self.animation_step % len(icons)])
-        self.animation_step += 1
-    
-    def update_status(self, status_text):
-        """상태 업데이트"""
-        self.status_label.setText(status_text)
-    
-    def update_detail(self, detail_text):
-        """세부 정보 업데이트"""
-        self.detail_label.setText(detail_text)
-    
-    def finish_and_close(self, delay=2000):
-        """인쇄 완료 후 자동 닫기"""
-        self.animation_timer.stop()
-        self.icon_label.setText("✅")
-        self.status_label.setText("인쇄 완료!")
-        self.status_label.setStyleSheet("""
-            QLabel {
-                color: rgba(100, 255, 150, 1);
-                font-size: 18px;
-                font-weight: bold;
-                background: transparent;
-                border: none;
-                text-shadow: 0 2px 8px rgba(100, 255, 150, 0.5);
-            }
-        """)
-        self.progress_bar.setRange(0, 100)
-        self.progress_bar.setValue(100)
-        self.progress_bar.setStyleSheet("""
-            QProgressBar {
-                background: rgba(255, 255, 255, 0.2);
-                border: none;
-                border-radius: 4px;
+        try:
+            import win32print
+            import win32ui
+            from PIL import ImageWin
+        except ImportError:
+            print("Windows 환경이 아닙니다. pywin32가 필요합니다.")
+            win32print = win32ui = ImageWin = None
+        self.win32print = win32print
+        self.win32ui = win32ui
+        self.ImageWin = ImageWin
+    
+    def open_printer(self, printer_name):
+        return self.win32print.OpenPrinter(printer_name)
+    
+    def close_printer(self, handle):
+        self.win32print.ClosePrinter(handle)
+    
+    def check_printer(self, handle):
+        """핸들 유효성 확인 (끊긴 핸들이면 예외 발생)"""
+        self.win32print.GetPrinter(handle, 2)
+    
+    def printer_status(self, handle):
+        """프린터/스풀러 상태 조회"""
+        info = self.win32print.GetPrinter(handle, 2)
+        return status_from_flags(info['Status'], info['Attributes'], info['cJobs'])
+    
+    def create_dc(self, printer_name):
+        hdc = self.win32ui.CreateDC()
+        hdc.CreatePrinterDC(printer_name)
+        return hdc
+    
+    def delete_dc(self, hdc):
+        hdc.DeleteDC()
+    
+    def write_raw(self, handle, payload, doc_name):
+        """RAW 문서 전송 (WritePrinter)"""
+        win32print = self.win32print
+        win32print.StartDocPrinter(handle, 1, (doc_name, None, "RAW"))
+        try:
+            win32print.StartPagePrinter(handle)
+            win32print.WritePrinter(handle, payload)
+            win32print.EndPagePrinter(handle)
+        finally:
+            win32print.EndDocPrinter(handle)
+    
+    def draw_pages(self, hdc, bitmaps, doc_name):
+        """1비트 비트맵들을 한 문서의 여러 페이지로 인쇄"""
+        hdc.StartDoc(doc_name)
+        try:
+            for bitmap in bitmaps:
+                hdc.StartPage()
+                # 1비트 DIB로 프린터에 전송 (RGB 변환 없음)
+                label_img = Image.frombytes('1', (bitmap.width, bitmap.height), bitmap.data)
+                dib = self.ImageWin.Dib(label_img)
+                dib.draw(hdc.GetHandleOutput(), (0, 0, bitmap.width, bitmap.height))
+                hdc.EndPage()
+        except Exception:
+            hdc.AbortDoc()
+            raise
+        hdc.EndDoc()
+
+
+class FakeSpoolerApi:
+    """가짜 스풀러 - Windows 없이 세션 재사용/재연결 동작 확인용
+    
+    호출 횟수와 전송 문서를 기록하고, fail_next 로 다음 N번의 전송 실패를,
+    stale 로 열린 핸들의 끊김을, status_flags / attributes 로 프린터 상태를 흉내 낼 수 있다.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.opened = 0
+        self.closed = 0
+        self.dcs_created = 0
+        self.documents = []  # (문서 이름, 페이로드 또는 페이지 수)
+        self.fail_next = 0
+        self.stale = False
+        self.status_flags = 0
+        self.attributes = 0
+    
+    def open_printer(self, printer_name):
+        with self.lock:
+            self.opened += 1
+            self.stale = False
+            return self.opened
+    
+    def close_printer(self, handle):
+        with self.lock:
+            self.closed += 1
+    
+    def check_printer(self, handle):
+        if self.stale:
+            raise OSError("끊긴 프린터 핸들 (fake)")
+    
+    def printer_status(self, handle):
+        self.check_printer(handle)
+        return status_from_flags(self.status_flags, self.attributes, len(self.documents))
+    
+    def create_dc(self, printer_name):
+        with self.lock:
+            self.dcs_created += 1
+            return self.dcs_created
+    
+    def delete_dc(self, hdc):
+        pass
+    
+    def fail_if_requested(self):
+        with self.lock:
+            if self.fail_next > 0:
+                self.fail_next -= 1
+                raise OSError("스풀러 오류 (fake)")
+    
+    def write_raw(self, handle, payload, doc_name):
+        self.fail_if_requested()
+        with self.lock:
+            self.documents.append((doc_name, payload))
+    
+    def draw_pages(self, hdc, bitmaps, doc_name):
+        self.fail_if_requested()
+        with self.lock:
+            self.documents.append((doc_name, len(bitmaps)))
+
+
+class PrinterSession:
+    """프린터 세션 관리자 - 프린터 핸들(use_dc면 프린터 DC도)을 작업 간에 재사용
+    
+    재사용 전에 핸들 유효성을 확인하고, 끊겼거나 작업 중 오류가 나면 세션을 닫는다.
+    다시 열 때는 연속 실패 횟수에 따라 대기 시간을 늘린다 (지수 백오프).
+    """
+    
+    def __init__(self, printer_name, api, use_dc=False, backoff=0.5, max_backoff=30.0):
+        self.printer_name = printer_name
+        self.api = api
+        self.use_dc = use_dc
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        
+        self.lock = threading.Lock()
+        self.handle = None
+        self.dc = None
+        self.failures = 0
+        self.retry_at = 0.0
+        
+        # 상태 조회 전용 핸들 (인쇄 중에도 막히지 않도록 세션 핸들과 별도)
+        self.probe_lock = threading.Lock()
+        self.probe_handle = None
+        
+        # 통계
+        self.opens = 0
+        self.reuses = 0
+        self.stale = 0
+    
+    def connect(self):
+        """세션 열기 (열려 있으면 유효성 확인 후 재사용) - lock 보유 상태에서 호출"""
+        if self.handle is not None:
+            try:
+                self.api.check_printer(self.handle)
+                self.reuses += 1
+                return
+            except Exception:
+                self.stale += 1
+                self.disconnect()
+        
+        wait = self.retry_at - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        
+        try:
+            self.handle = self.api.open_printer(self.printer_name)
+            if self.use_dc:
+                self.dc = self.api.create_dc(self.printer_name)
+        except Exception:
+            self.disconnect()
+            self.mark_failure()
+            raise
+        self.opens += 1
+    
+    def disconnect(self):
+        """세션 닫기 (오류 무시) - lock 보유 상태에서 호출"""
+        if self.dc is not None:
+            try:
+                self.api.delete_dc(self.dc)
+            except Exception:
+                pass
+            self.dc = None
+        if self.handle is not None:
+            try:
+                self.api.close_printer(self.handle)
+            except Exception:
+                pass
+            self.handle = None
+    
+    def mark_failure(self):
+        """연속 실패 기록 → 다음 연결 시도까지 대기 시간 설정"""
+        self.failures += 1
+        delay = min(self.max_backoff, self.backoff * (2 ** (self.failures - 1)))
+        self.retry_at = time.monotonic() + delay
+    
+    def run(self, operation):
+        """operation(handle, dc) 실행 - 실패하면 세션을 닫아 다음 작업에서 다시 연결"""
+        with self.lock:
+            self.connect()
+            try:
+                result = operation(self.handle, self.dc)
+            except Exception:
+                self.disconnect()
+                self.mark_failure()
+                raise
+            self.failures = 0
+            return result
+    
+    def probe(self):
+        """프린터 상태 조회 → PrinterStatus (열 수 없으면 오프라인)"""
+        with self.probe_lock:
+            try:
+                if self.probe_handle is None:
+                    self.probe_handle = self.api.open_printer(self.printer_name)
+                return self.api.printer_status(self.probe_handle)
+            except Exception as e:
+                self.close_probe()
+                return PrinterStatus(False, 'offline', str(e))
+    
+    def close_probe(self):
+        """상태 조회 핸들 닫기 - probe_lock 보유 상태에서 호출"""
+        if self.probe_handle is not None:
+            try:
+                self.api.close_printer(self.probe_handle)
+            except Exception:
+                pass
+            self.probe_handle = None
+    
+    def close(self):
+        """세션 종료"""
+        with self.lock:
+            self.disconnect()
+        with self.probe_lock:
+            self.close_probe()
+    
+    def stats(self):
+        """세션 통계"""
+        return {
+            'connected': self.handle is not None,
+            'opens': self.opens,
+            'reuses': self.reuses,
+            'stale': self.stale,
+            'failures': self.failures,
+        }
+
+
+class PrinterBackend:
+    """프린터 출력 백엔드 인터페이스
+    
+    render(data)     : 라벨 데이터 → 출력 페이로드 (이미지 또는 명령 바이트)
+    spool(payloads)  : 페이로드를 하나의 인쇄 문서로 프린터에 전송
+    check_status()   : 프린터 상태 조회 → PrinterStatus (상태 감시용, 인쇄 경로와 별개)
+    stats()          : 연결 통계 (세션을 쓰는 백엔드만, 없으면 빈 dict)
+    """
+    
+    name = 'base'
+    
+    def render(self, data):
+        raise NotImplementedError
+    
+    def spool(self, payloads, doc_name="Label Print"):
+        raise NotImplementedError
+    
+    def check_status(self):
+        return PrinterStatus(True, 'ready', '')
+    
+    def stats(self):
+        return {}
+    
+    def close(self):
+        """백엔드 자원 정리"""
+        pass
+
+
+class GdiBackend(PrinterBackend):
+    """GDI 래스터 출력 - 1비트 비트맵을 프린터 DC에 그림 (핸들/DC는 세션에서 재사용)"""
+    
+    name = 'gdi'
+    
+    def __init__(self, session, renderer):
+        self.session = session  # PrinterSession(use_dc=True)
+        self.renderer = renderer  # data → 1비트 PIL 이미지
+    
+    def render(self, data):
+        return pack_bitmap(self.renderer(data))
+    
+    def spool(self, payloads, doc_name="Label Print"):
+        api = self.session.api
+        self.session.run(lambda handle, hdc: api.draw_pages(hdc, payloads, doc_name))
+    
+    def check_status(self):
+        return self.session.probe()
+    
+    def stats(self):
+        return self.session.stats()
+    
+    def close(self):
+        self.session.close()
+
+
+class NullBackend(PrinterBackend):
+    """출력 없는 백엔드 - 라벨은 실제로 생성하고 전송만 버림 (부하 테스트용)
+    
+    spool_delay 로 프린터 전송 시간을, status 로 프린터 상태를 흉내 낼 수 있다 (라벨 1장당 초).
+    """
+    
+    name = 'null'
+    
+    def __init__(self, renderer, spool_delay=0.0):
+        self.renderer = renderer
+        self.spool_delay = spool_delay
+        self.status = PrinterStatus(True, 'ready', '')
+        self.lock = threading.Lock()
+        self.documents = 0
+        self.pages = 0
+    
+    def render(self, data):
+        return pack_bitmap(self.renderer(data))
+    
+    def spool(self, payloads, doc_name="Label Print"):
+        if self.spool_delay:
+            time.sleep(self.spool_delay * len(payloads))
+        with self.lock:
+            self.documents += 1
+            self.pages += len(payloads)
+    
+    def check_status(self):
+        return self.status
+
+
+class BplzEncoder:
+    """BPL-Z(ZPL 호환) 라벨 명령 생성기
+    
+    텍스트와 QR(^BQ)을 프린터가 직접 그리도록 명령만 생성한다.
+    레이아웃은 GDI 경로와 같은 라벨 템플릿(LabelTemplate)을 사용한다.
+    한글 출력에는 프린터에 한글 TTF 폰트가 저장되어 있어야 하며,
+    printer.bplz_font 에 ^A 파라미터(예: "@N,24,24,E:MALGUN.TTF")를 지정한다.
+    """
+    
+    JUSTIFY = {'center': 'C', 'right': 'R'}
+    
+    def __init__(self, config, template):
+        self.template = template
+        self.qr_magnification = config.get('bplz_qr_magnification', 5)
+        self.font = config.get('bplz_font', '0N,24,24')
+    
+    @staticmethod
+    def escape(text):
+        """^FH 16진수 이스케이프 (명령 문자 ^ ~ 와 이스케이프 문자 _ 처리)"""
+        return str(text).replace('_', '_5F').replace('^', '_5E').replace('~', '_7E')
+    
+    def field(self, x, y, text, width=0, align='left'):
+        """텍스트 필드 (프린터 내장/저장 폰트, 가운데/오른쪽 정렬은 ^FB 블록)"""
+        block = f"^FB{width},1,0,{self.JUSTIFY[align]},0" if align in self.JUSTIFY else ""
+        return f"^FO{x},{y}^A{self.font}{block}^FH^FD{self.escape(text)}^FS"
+    
+    def encode(self, data):
+        """라벨 데이터 → BPL-Z 명령 바이트"""
+        template = self.template
+        commands = [
+            "^XA",
+            "^CI28",  # UTF-8
+            f"^PW{template.width}",
+            f"^LL{template.height}",
+            "^LH0,0",
+        ]
+        for (x0, y0, x1, y1), width in template.borders:
+            commands.append(f"^FO{x0},{y0}^GB{x1 - x0},{y1 - y0},{width}^FS")
+        
+        # QR 코드 (모델 2, 오류 정정 L, 자동 입력 모드)
+        commands.append(
+            f"^FO{template.qr_x},{template.qr_y}^BQN,2,{self.qr_magnification}"
+            f"^FH^FDLA,{self.escape(data.get('qr_data', 'NO DATA'))}^FS"
+        )
+        for field in template.fields:
+            text = field.caption + template.field_value(field, data)
+            commands.append(self.field(field.x, field.y, text, field.width, field.align))
+        commands.append("^XZ")
+        
+        return "\n".join(commands).encode('utf-8') + b"\n"
+    
+    def encode_bitmap(self, bitmap):
+        """패킹 비트맵 → BPL-Z 그래픽(^GFB) 명령 바이트 (이진 전송, 16진 변환 없음)"""
+        row_bytes = (bitmap.width + 7) // 8
+        data = bitmap.data.translate(INVERT_TABLE)
+        header = (
+            f"^XA\n^PW{bitmap.width}\n^LL{bitmap.height}\n^LH0,0\n"
+            f"^FO0,0^GFB,{len(data)},{len(data)},{row_bytes},"
+        ).encode('ascii')
+        return header + data + b"^FS\n^XZ\n"
+
+
+class RawPrinterSink:
+    """스풀러 RAW 전송 (WritePrinter, 프린터 핸들은 세션에서 재사용)"""
+    
+    def __init__(self, session):
+        self.session = session
+    
+    def write(self, payload, doc_name="Label Print"):
+        api = self.session.api
+        self.session.run(lambda handle, hdc: api.write_raw(handle, payload, doc_name))
+    
+    def check_status(self):
+        return self.session.probe()
+    
+    def stats(self):
+        return self.session.stats()
+    
+    def close(self):
+        self.session.close()
+
+
+class FileSink:
+    """파일 출력 - 프린터 없이 명령 바이트 확인용"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+    
+    def write(self, payload, doc_name="Label Print"):
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        with self.lock:
+            with open(self.path, 'ab') as f:
+                f.write(payload)
+    
+    def check_status(self):
+        folder = os.path.dirname(self.path) or '.'
+        if os.path.isdir(folder) and not os.access(folder, os.W_OK):
+            return PrinterStatus(False, 'error', f"쓰기 권한 없음: {folder}")
+        return PrinterStatus(True, 'ready', '')
+
+
+class TcpSink:
+    """TCP RAW 포트(기본 9100) 직접 전송"""
+    
+    def __init__(self, host, port=9100, timeout=5.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+    
+    def write(self, payload, doc_name="Label Print"):
+        with socket.create_connection((self.host, self.port), timeout=self.timeout) as sock:
+            sock.sendall(payload)
+    
+    def check_status(self):
+        """연결만 열었다 닫아 프린터 응답 여부 확인"""
+        try:
+            with socket.create_connection((self.host, self.port), timeout=min(self.timeout, 2.0)):
+                return PrinterStatus(True, 'ready', '')
+        except OSError as e:
+            return PrinterStatus(False, 'offline', f"{self.host}:{self.port} 연결 실패 ({e})")
+
+
+class BplzBackend(PrinterBackend):
+    """BPL-Z 명령 출력
+    
+    text  : 프린터가 직접 텍스트/QR을 그림 (작업당 수백 바이트)
+    raster: 1비트 라벨 이미지를 ^GFB 그래픽으로 전송 (프린터 폰트 불필요)
+    """
+    
+    name = 'bplz'
+    
+    def __init__(self, encoder, sink, renderer=None):
+        self.encoder = encoder
+        self.sink = sink
+        self.renderer = renderer  # raster 모드일 때만 사용
+    
+    def render(self, data):
+        if self.renderer is not None:
+            return self.encoder.encode_bitmap(pack_bitmap(self.renderer(data)))
+        return self.encoder.encode(data)
+    
+    def spool(self, payloads, doc_name="Label Print"):
+        self.sink.write(b"".join(payloads), doc_name)
+    
+    def check_status(self):
+        check = getattr(self.sink, 'check_status', None)
+        if check is None:
+            return PrinterStatus(True, 'ready', '')
+        return check()
+    
+    def stats(self):
+        stats = getattr(self.sink, 'stats', None)
+        return stats() if stats is not None else {}
+    
+    def close(self):
+        close = getattr(self.sink, 'close', None)
+        if close is not None:
+            close()
+
+
+def create_session(printer_name, printer_config, use_dc=False):
+    """프린터 세션 생성 (printer.spooler가 "fake"면 가짜 스풀러 사용)"""
+    api = FakeSpoolerApi() if printer_config.get('spooler') == 'fake' else Win32SpoolerApi()
+    return PrinterSession(
+        printer_name,
+        api,
+        use_dc=use_dc,
+        backoff=printer_config.get('reconnect_backoff', 0.5),
+        max_backoff=printer_config.get('reconnect_max_backoff', 30.0)
+    )
+
+
+def create_sink(printer_name, printer_config):
+    """설정에 따른 RAW 출력 대상 생성 (spooler / file / tcp)"""
+    sink_type = printer_config.get('sink', 'spooler')
+    if sink_type == 'file':
+        return FileSink(printer_config.get('output_path', 'output/labels.bplz'))
+    if sink_type == 'tcp':
+        return TcpSink(
+            printer_config.get('tcp_host', '127.0.0.1'),
+            printer_config.get('tcp_port', 9100)
+        )
+    return RawPrinterSink(create_session(printer_name, printer_config))
+
+
+def create_backend(printer_name, printer_config, renderer, template):
+    """설정에 따른 프린터 백엔드 생성 (gdi / bplz / null)"""
+    backend_type = printer_config.get('backend', 'gdi')
+    if backend_type == 'null':
+        return NullBackend(renderer, printer_config.get('null_spool_delay', 0.0))
+    if backend_type == 'bplz':
+        raster = printer_config.get('bplz_mode', 'text') == 'raster'
+        return BplzBackend(
+            BplzEncoder(printer_config, template),
+            create_sink(printer_name, printer_config),
+            renderer=renderer if raster else None
+        )
+    return GdiBackend(create_session(printer_name, printer_config, use_dc=True), renderer)
+
+
+def normalize_label(data, template):
+    """라벨 데이터 정규화 - 템플릿이 실제로 그리는 값 (QR 데이터 + 템플릿 필드, 기본값 적용)"""
+    normalized = {field.key: template.field_value(field, data) for field in template.fields}
+    normalized['qr_data'] = str(data.get('qr_data', 'NO DATA'))
+    return normalized
+
+
+def label_key(data, template):
+    """정규화된 라벨 데이터의 해시 키 (템플릿에 없는 항목은 라벨에 영향이 없으므로 제외)"""
+    canonical = json.dumps(normalize_label(data, template), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def payload_size(payload):
+    """페이로드 메모리 크기 추정 (바이트)"""
+    if isinstance(payload, PackedBitmap):
+        return len(payload.data)
+    return len(payload)
+
+
+def build_qr_matrix(data):
+    """QR 모듈 행렬 생성 → (한 변 모듈 수, 모듈당 1바이트 픽셀: 0=검정, 255=흰색)"""
+    import qrcode  # 첫 QR 생성 시 로드 (BPL-Z 텍스트 모드에서는 불필요)
+
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        border=2,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    
+    matrix = qr.get_matrix()  # 여백(border) 포함
+    pixels = bytes(0 if cell else 255 for row in matrix for cell in row)
+    return len(matrix), pixels
+
+
+class LabelCache:
+    """렌더링된 라벨 페이로드 LRU 캐시 (개수/메모리 제한, metrics가 있으면 제거 횟수를 cache_evictions_total로 집계)"""
+    
+    def __init__(self, max_entries=128, max_bytes=32 * 1024 * 1024, metrics=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.metrics = metrics
+        self.entries = OrderedDict()  # key → (payload, size)
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key):
+        """캐시 조회 (없으면 None)"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key, payload):
+        """캐시 저장 (한도 초과 시 오래된 항목부터 제거)"""
+        size = payload_size(payload)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        evicted = 0
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self.entries[key] = (payload, size)
+            self.total_bytes += size
+            while len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+                evicted += 1
+        if evicted and self.metrics is not None:
+            self.metrics.inc('cache_evictions_total', evicted)
+    
+    def clear(self):
+        """캐시 비우기"""
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+    
+    def stats(self):
+        """캐시 통계"""
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
             }
-            QProgressBar::chunk {
-                background: qlineargradient(
-                    x1:0, y1:0, x2:1, y2:0,
-                    stop:0 rgba(100, 255, 150, 0.8),
-                    stop:0.5 rgba(150, 255, 180, 1),
-                    stop:1 rgba(100, 255, 150, 0.8)
-                );
-                border-radius: 4px;
+
+
+class DailyFileHandler(logging.FileHandler):
+    """날짜별 로그 파일 핸들러
+    
+    logs/YYYY-MM-DD.log 에 기록하고, 자정이 지나면 새 날짜 파일로 전환한다.
+    전환할 때 보관 기간(retention_days)이 지난 로그 파일은 삭제한다.
+    """
+    
+    def __init__(self, folder='logs', retention_days=30):
+        self.folder = folder
+        self.retention_days = retention_days
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        self.next_rollover = self.compute_rollover(time.time())
+        super().__init__(self.path_for(time.time()), encoding='utf-8', delay=True)
+        self.cleanup()
+    
+    def path_for(self, timestamp):
+        return os.path.join(self.folder, f"{datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')}.log")
+    
+    @staticmethod
+    def compute_rollover(timestamp):
+        """다음 자정 시각"""
+        day = datetime.fromtimestamp(timestamp).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (day + timedelta(days=1)).timestamp()
+    
+    def emit(self, record):
+        if record.created >= self.next_rollover:
+            self.rollover(record.created)
+        super().emit(record)
+    
+    def rollover(self, timestamp):
+        """새 날짜 파일로 전환"""
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        self.baseFilename = os.path.abspath(self.path_for(timestamp))
+        self.next_rollover = self.compute_rollover(timestamp)
+        self.cleanup()
+    
+    def cleanup(self):
+        """보관 기간이 지난 로그 파일 삭제"""
+        if not self.retention_days:
+            return
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime('%Y-%m-%d')
+        for name in os.listdir(self.folder):
+            stem, ext = os.path.splitext(name)
+            if ext == '.log' and len(stem) == 10 and stem < cutoff:
+                try:
+                    os.remove(os.path.join(self.folder, name))
+                except OSError:
+                    pass
+
+
+class JsonLineFormatter(logging.Formatter):
+    """JSON Lines 로그 포맷 (한 줄에 레코드 하나)"""
+    
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """로그 큐 핸들러 - 큐가 가득 차면 기다리지 않고 레코드를 버림"""
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def setup_logging(log_config=None):
+    """'BixolonPrinter' 로거 설정 (프로세스당 한 번)
+    
+    호출 스레드는 큐에 레코드를 넣기만 하고, 파일 쓰기는 QueueListener 스레드가 처리한다.
+    """
+    logger = logging.getLogger('BixolonPrinter')
+    if logger.handlers:
+        return logger
+    
+    log_config = log_config or {}
+    logger.setLevel(getattr(logging, str(log_config.get('level', 'INFO')).upper(), logging.INFO))
+    logger.propagate = False
+    
+    # 파일 핸들러 (날짜별 파일, 자정 전환)
+    file_handler = DailyFileHandler(
+        folder=log_config.get('folder', 'logs'),
+        retention_days=log_config.get('retention_days', 30)
+    )
+    if log_config.get('format', 'text') == 'json':
+        file_handler.setFormatter(JsonLineFormatter())
+    else:
+        file_handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s'))
+    
+    # 큐 핸들러 → 백그라운드 기록 스레드
+    log_queue = queue.Queue(maxsize=log_config.get('queue_size', 10000))
+    listener = QueueListener(log_queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)  # 종료 시 남은 로그 기록
+    
+    logger.addHandler(DroppingQueueHandler(log_queue))
+    return logger
+
+
+# 한글 폰트 탐색 경로 (Windows → Linux → macOS, 마지막은 영문 폰트)
+FONT_SEARCH_PATHS = [
+    "C:\\Windows\\Fonts\\malgun.ttf",      # 맑은 고딕
+    "C:\\Windows\\Fonts\\gulim.ttc",       # 굴림
+    "C:\\Windows\\Fonts\\batang.ttc",      # 바탕
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/google-noto-cjk/NotoSansCJK-Regular.ttc",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "C:\\Windows\\Fonts\\arial.ttf",       # Arial (영문)
+]
+
+
+class FontRegistry:
+    """폰트 레지스트리
+    
+    폰트 경로는 생성 시 한 번만 탐색하고, (경로, 크기)별 폰트 인스턴스는
+    프로세스가 끝날 때까지 캐시한다. 인쇄 경로에서는 파일 시스템에 접근하지 않는다.
+    """
+    
+    # 프로세스 전체에서 공유하는 캐시
+    fonts = {}        # (path, size) → ImageFont
+    load_times = {}   # (path, size) → 로드 시간 (초)
+    lock = threading.Lock()
+    
+    def __init__(self, font_path=None):
+        self.candidates = ([font_path] if font_path else []) + FONT_SEARCH_PATHS
+        self.path = self.resolve()
+    
+    def resolve(self):
+        """사용 가능한 첫 번째 폰트 경로 (없으면 None → PIL 기본 폰트)"""
+        for font_path in self.candidates:
+            if os.path.exists(font_path):
+                try:
+                    self.get(18, font_path)
+                    return font_path
+                except OSError:
+                    continue
+        return None
+    
+    def get(self, size, font_path=None):
+        """(경로, 크기)에 해당하는 폰트 (최초 1회만 로드)"""
+        key = (font_path or self.path, size)
+        font = self.fonts.get(key)
+        if font is not None:
+            return font
+        
+        with self.lock:
+            font = self.fonts.get(key)
+            if font is None:
+                started = time.perf_counter()
+                if key[0] is None:
+                    font = ImageFont.load_default()
+                else:
+                    font = ImageFont.truetype(key[0], size)
+                self.load_times[key] = time.perf_counter() - started
+                self.fonts[key] = font
+        return font
+    
+    def stats(self):
+        """폰트 로드 통계"""
+        with self.lock:
+            return {
+                'path': self.path,
+                'loaded': len(self.fonts),
+                'load_ms': {
+                    f"{os.path.basename(path) if path else 'default'}@{size}": round(seconds * 1000, 2)
+                    for (path, size), seconds in self.load_times.items()
+                },
             }
-        """)
-        self.close_timer.start(delay)
+
+
+# 기본 라벨 템플릿 (용지 55mm x 32mm, 203 DPI 기준 - QR 왼쪽, 정보 4줄 오른쪽)
+DEFAULT_TEMPLATE = {
+    "width": 800,
+    "height": 240,
+    "font_size": 24,
+    "qr": {"x": 220, "y": "center", "size": 132},
+    "fields": [
+        {"key": "name", "caption": "이름: ", "x": 382, "y": 23},
+        {"key": "employee_id", "caption": "사번: ", "x": 382, "y": 78},
+        {"key": "department", "caption": "소속: ", "x": 382, "y": 133},
+        {"key": "issue_date", "caption": "발급: ", "x": 382, "y": 188, "default": "today"},
+    ],
+    "borders": [],
+}
+
+# 컴파일된 텍스트 필드 (value_x: 캡션 바로 뒤 값 시작 위치, 왼쪽 정렬일 때만)
+TemplateField = namedtuple('TemplateField', 'key caption x y width align font font_size default value_x')
+
+
+class LabelTemplate:
+    """라벨 템플릿
+    
+    설정의 template 항목을 시작 시 한 번 컴파일해 위치/폰트를 미리 계산하고,
+    캡션과 테두리 같은 고정 요소는 정적 배경으로 미리 그려 둔다.
+    인쇄 시에는 배경을 복사한 뒤 QR과 값만 그린다.
+    
+    필드 옵션: key, caption, x, y, font_size, align(left/center/right), width, default("today" 가능)
+    """
+    
+    ALIGNS = ('left', 'center', 'right')
+    
+    def __init__(self, template_config, fonts):
+        config = template_config or DEFAULT_TEMPLATE
+        self.width = int(config.get('width', 800))
+        self.height = int(config.get('height', 240))
+        font_size = int(config.get('font_size', 24))
+        
+        qr = config.get('qr', {})
+        self.qr_size = int(qr.get('size', 132))
+        self.qr_x = self.position(qr.get('x', 0), self.width, self.qr_size)
+        self.qr_y = self.position(qr.get('y', 'center'), self.height, self.qr_size)
+        
+        self.borders = [
+            (tuple(border['box']), int(border.get('width', 1)))
+            for border in config.get('borders', [])
+        ]
+        self.fields = [self.compile_field(field, font_size, fonts) for field in config.get('fields', [])]
+        self.background = self.render_background()
+    
+    @staticmethod
+    def position(value, total, size):
+        """좌표 ("center"면 가운데 정렬 좌표)"""
+        if value == 'center':
+            return (total - size) // 2
+        return int(value)
+    
+    def compile_field(self, field, font_size, fonts):
+        """필드 설정 → TemplateField"""
+        align = field.get('align', 'left')
+        if align not in self.ALIGNS:
+            raise ValueError(f"알 수 없는 정렬: {align}")
+        if align != 'left' and 'width' not in field:
+            raise ValueError(f"{align} 정렬 필드에는 width가 필요합니다: {field.get('key')}")
+        
+        size = int(field.get('font_size', font_size))
+        font = fonts.get(size)
+        caption = field.get('caption', '')
+        x = int(field['x'])
+        value_x = x + int(round(font.getlength(caption))) if align == 'left' else None
+        
+        return TemplateField(
+            key=field['key'],
+            caption=caption,
+            x=x,
+            y=int(field['y']),
+            width=int(field.get('width', 0)),
+            align=align,
+            font=font,
+            font_size=size,
+            default=field.get('default', ''),
+            value_x=value_x,
+        )
+    
+    def render_background(self):
+        """정적 배경 (테두리 + 왼쪽 정렬 필드의 캡션)"""
+        background = Image.new('1', (self.width, self.height), 1)
+        draw = ImageDraw.Draw(background)
+        for box, width in self.borders:
+            draw.rectangle(box, outline=0, width=width)
+        for field in self.fields:
+            if field.align == 'left' and field.caption:
+                draw.text((field.x, field.y), field.caption, fill=0, font=field.font)
+        return background
+    
+    @staticmethod
+    def field_value(field, data):
+        """필드 값 (없으면 기본값, "today"는 오늘 날짜)"""
+        value = data.get(field.key)
+        if value is None:
+            if field.default == 'today':
+                return datetime.now().strftime('%Y-%m-%d')
+            return str(field.default)
+        return str(value)
+    
+    def render(self, data, qr_renderer):
+        """라벨 이미지 생성 (배경 복사 → QR → 가변 텍스트)"""
+        label = self.background.copy()
+        
+        qr_img = qr_renderer(data.get('qr_data', 'NO DATA'), size=self.qr_size)
+        label.paste(qr_img, (self.qr_x, self.qr_y))
+        
+        draw = ImageDraw.Draw(label)
+        for field in self.fields:
+            value = self.field_value(field, data)
+            if field.align == 'left':
+                draw.text((field.value_x, field.y), value, fill=0, font=field.font)
+                continue
+            
+            text = field.caption + value
+            text_width = int(round(field.font.getlength(text)))
+            if field.align == 'center':
+                x = field.x + (field.width - text_width) // 2
+            else:
+                x = field.x + field.width - text_width
+            draw.text((x, field.y), text, fill=0, font=field.font)
+        
+        return label
 
 
 class BixolonLabelPrinter:
     """BIXOLON 라벨 프린터 제어 클래스"""
     
-    def __init__(self, printer_name="BIXOLON XD5-40d - BPL-Z", config=None):
+    def __init__(self, printer_name="BIXOLON XD5-40d - BPL-Z", config=None, metrics=None, signals=None):
         self.printer_name = printer_name
         self.config = config or {}
-        self.signals = PrintSignals()
-        self.font = self.load_font()
+        self.metrics = metrics or Metrics()
+        self.signals = signals or PrintSignals()
+        self.last_error = None  # 마지막 작업의 출력(스풀) 오류 - 라벨 생성 오류는 제외
+        self.process_renderer = None  # 큰 일괄 작업용 다중 프로세스 생성 (ProcessRenderer, 키)
         self.setup_logger()
+        self.fonts = FontRegistry(self.config.get('printer', {}).get('font_path'))
+        self.font = self.load_font()
+        self.template = LabelTemplate(self.config.get('template'), self.fonts)
+        self.logger.info(f"🔤 폰트: {self.fonts.stats()}")
+        self.backend = create_backend(
+            printer_name,
+            self.config.get('printer', {}),
+            self.create_label_image,
+            self.template
+        )
+        cache_config = self.config.get('cache', {})
+        self.cache = LabelCache(
+            max_entries=cache_config.get('max_entries', 128),
+            max_bytes=cache_config.get('max_bytes', 32 * 1024 * 1024),
+            metrics=self.metrics
+        )
+        
+        # QR 행렬 캐시 (qr_data별, 0이면 사용 안 함)
+        qr_cache_size = cache_config.get('qr_matrices', 256)
+        self.qr_matrix = lru_cache(maxsize=qr_cache_size)(build_qr_matrix) if qr_cache_size else build_qr_matrix
         
     def setup_logger(self):
-        """로거 설정"""
-        # logs 폴더 생성
-        if not os.path.exists('logs'):
-            os.makedirs('logs')
+        """로거 설정 (비동기 기록, 날짜별 파일 자동 전환)"""
+        self.logger = setup_logging(self.config.get('logging'))
         
-        # 오늘 날짜로 로그 파일명 생성
-        today = datetime.now().strftime('%Y-%m-%d')
-        log_file = f'logs/{today}.log'
+    def load_font(self):
+        """한글 폰트 로드 (레지스트리에서 탐색된 폰트, 없으면 기본 폰트)"""
+        return self.fonts.get(18)
+    
+    def create_qr_code(self, data, size=200):
+        """QR 코드 이미지 생성 (1비트, 정수 배율 모듈 - 보간 없음)"""
+        with self.metrics.timer('qr'):
+            return self.draw_qr_code(data, size)
+    
+    def draw_qr_code(self, data, size):
+        """QR 모듈 행렬 → 정수 배율 1비트 이미지"""
+        modules, pixels = self.qr_matrix(str(data))  # 캐시 키는 문자열 (dict/list 같은 값도 그대로 인쇄되도록)
+        img = Image.frombytes('L', (modules, modules), pixels).convert('1', dither=Image.Dither.NONE)
+        
+        # 박스에 들어가는 최대 정수 배율로 확대 (모듈 경계가 흐려지지 않음)
+        scale = size // modules
+        if scale < 1:
+            # 축소하면 모듈이 빠져 읽을 수 없는 QR이 인쇄되므로 생성 실패로 처리
+            raise ValueError(f"QR 데이터가 너무 깁니다 ({modules}모듈 > {size}px, {len(str(data))}자)")
+        img = img.resize((modules * scale, modules * scale), Image.Resampling.NEAREST)
+        
+        if img.width == size:
+            return img
+        
+        # 남는 공간은 흰 여백으로 가운데 정렬
+        box = Image.new('1', (size, size), 1)
+        offset = (size - img.width) // 2
+        box.paste(img, (offset, offset))
+        return box
+    
+    def create_label_image(self, data):
+        """라벨 이미지 생성 (템플릿 배경 + QR 코드 + 텍스트 정보)"""
+        return self.template.render(data, self.create_qr_code)
+    
+    def render_label(self, data):
+        """라벨 페이로드 생성 (같은 내용은 캐시에서 재사용)"""
+        key = label_key(data, self.template)
+        payload = self.cache.get(key)
+        self.metrics.inc('cache_hits_total' if payload is not None else 'cache_misses_total')
+        if payload is None:
+            payload = self.backend.render(data)
+            self.cache.put(key, payload)
+        else:
+            self.logger.info("♻️ 캐시된 라벨 재사용")
+        return payload
+    
+    def print_label(self, data):
+        """라벨 인쇄"""
+        return self.print_labels([data])[0]
+    
+    def print_labels(self, labels):
+        """여러 라벨을 하나의 인쇄 문서로 인쇄 → 항목별 성공 여부 목록"""
+        return self.spool_labels(labels, self.render_labels(labels))
+    
+    def render_labels(self, labels):
+        """1단계: 라벨 생성 → (페이로드 목록, 생성에 성공한 항목 번호 목록)"""
+        if len(labels) == 1:
+            self.logger.info(f"인쇄 시작 - 데이터: {labels[0]}")  # ← 추가
+        else:
+            self.logger.info(f"일괄 인쇄 시작 - {len(labels)}건")
+        
+        if self.process_renderer is not None and self.process_renderer[0].accepts(len(labels)):
+            try:
+                return self.render_labels_in_workers(labels)
+            except Exception as e:
+                self.logger.error(f"✗ 다중 프로세스 생성 실패 - 현재 프로세스에서 생성: {e}")
         
-        # 로거 설정
-        self.logger = logging.getLogger('BixolonPrinter')
-        self.logger.setLevel(logging.INFO)
+        # 라벨 생성 (실패한 항목만 제외하고 나머지는 인쇄)
+        payloads = []
+        printed = []
+        for index, data in enumerate(labels):
+            try:
+                with self.metrics.timer('render'):
+                    payloads.append(self.render_label(data))
+                printed.append(index)
+            except Exception as e:
+                self.metrics.inc('render_errors_total')
+                self.logger.error(f"라벨 생성 오류 ({index + 1}번째): {str(e)}")
+        return payloads, printed
+    
+    def render_labels_in_workers(self, labels):
+        """큰 일괄 작업 생성 - 캐시에 없는 라벨만 작업 프로세스로 보내고 순서대로 합침"""
+        renderer, key = self.process_renderer
+        keys = [label_key(data, self.template) if isinstance(data, dict) else None for data in labels]
+        payloads = [self.cache.get(cache_key) if cache_key else None for cache_key in keys]
+        misses = [index for index, payload in enumerate(payloads) if payload is None]
+        self.metrics.inc('cache_hits_total', len(labels) - len(misses))
+        self.metrics.inc('cache_misses_total', len(misses))
+        
+        with self.metrics.timer('render_batch'):
+            rendered = renderer.render(key, [labels[index] for index in misses]) if misses else []
+        
+        errors = {}
+        for index, (payload, error) in zip(misses, rendered):
+            if payload is None:
+                errors[index] = error
+                continue
+            payloads[index] = payload
+            if keys[index]:
+                self.cache.put(keys[index], payload)
         
-        # 기존 핸들러 제거 (중복 방지)
-        self.logger.handlers.clear()
+        for index, error in sorted(errors.items()):
+            self.metrics.inc('render_errors_total')
+            self.logger.error(f"라벨 생성 오류 ({index + 1}번째): {error}")
         
-        # 파일 핸들러 추가
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(logging.INFO)
+        self.logger.info(f"⚡ 다중 프로세스 생성: {len(misses)}건 (캐시 {len(labels) - len(misses)}건)")
+        printed = [index for index, payload in enumerate(payloads) if payload is not None]
+        return [payloads[index] for index in printed], printed
+    
+    def spool_labels(self, labels, rendered):
+        """2단계: 생성된 라벨을 한 문서로 전송 → 항목별 성공 여부 목록"""
+        payloads, printed = rendered
+        results = [False] * len(labels)
+        self.last_error = None
         
-        # 포맷 설정
-        formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
-        file_handler.setFormatter(formatter)
+        if not payloads:
+            self.signals.update_status.emit("❌ 인쇄 오류: 라벨 생성 실패")
+            return results
         
-        self.logger.addHandler(file_handler)
+        try:
+            self.signals.update_status.emit("🔌 프린터 연결 중...")
+            
+            # 프린터로 전송 (한 문서에 여러 페이지)
+            with self.metrics.timer('spool'):
+                self.backend.spool(payloads)
+            
+            for index in printed:
+                results[index] = True
+            self.signals.update_status.emit("✓ 인쇄 완료!")
+            self.logger.info(f"인쇄 성공 ({len(printed)}/{len(labels)}건)")  # ← 추가
+                
+        except Exception as e:
+            self.last_error = str(e)
+            self.metrics.inc('spool_errors_total')
+            self.signals.update_status.emit(f"❌ 인쇄 오류: {str(e)}")
+            print(f"인쇄 오류: {e}")
+            self.logger.error(f"인쇄 오류: {str(e)}")  # ← 추가
         
-    def load_font(self):
-        """한글 폰트 로드"""
-        # Windows 기본 한글 폰트 경로들
-        font_paths = [
-            "C:\\Windows\\Fonts\\malgun.ttf",      # 맑은 고딕
-            "C:\\Windows\\Fonts\\gulim.ttc",       # 굴림
-            "C:\\Windows\\Fonts\\batang.ttc",      # 바탕
-            "C:\\Windows\\Fonts\\arial.ttf",       # Arial (영문)
+        return results
+
+
+# 렌더링 작업 프로세스의 프린터별 렌더러 (init_render_worker가 프로세스당 한 번 생성)
+_render_workers = {}
+
+
+def init_render_worker(specs):
+    """렌더링 프로세스 초기화 - 프린터별 폰트/템플릿/QR 캐시를 한 번만 준비
+    
+    specs: {키: (프린터 이름, 설정)}. 작업 프로세스는 로그 파일을 쓰지 않고
+    스풀러에도 연결하지 않는다 (라벨 생성만 담당).
+    """
+    logging.getLogger('BixolonPrinter').addHandler(logging.NullHandler())  # setup_logging 생략
+    for key, (printer_name, config) in specs.items():
+        config = dict(config, printer=dict(config.get('printer', {}), spooler='fake'))
+        config['cache'] = dict(config.get('cache', {}), max_entries=0)
+        _render_workers[key] = BixolonLabelPrinter(printer_name, config)
+
+
+def render_in_worker(key, labels):
+    """작업 프로세스에서 라벨 생성 → 항목별 (페이로드 간단 형태 또는 None, 오류 메시지)
+    
+    비트맵은 (너비, 높이, 바이트) 튜플, 명령 페이로드는 bytes 그대로 돌려준다.
+    """
+    backend = _render_workers[key].backend
+    results = []
+    for data in labels:
+        try:
+            payload = backend.render(data)
+        except Exception as e:
+            results.append((None, str(e)))
+            continue
+        results.append((tuple(payload) if isinstance(payload, PackedBitmap) else payload, None))
+    return results
+
+
+class ProcessRenderer:
+    """다중 프로세스 라벨 생성 - 큰 일괄 작업을 CPU 코어 수만큼 나눠 생성
+    
+    라벨을 chunk_size개씩 나눠 작업 프로세스에 보내고 결과는 접수 순서대로 모은다.
+    min_batch보다 작은 작업은 기존처럼 같은 프로세스에서 바로 생성한다 (지연 시간 우선).
+    """
+    
+    def __init__(self, specs, max_workers=None, min_batch=32, chunk_size=16):
+        self.specs = specs
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_batch = min_batch
+        self.chunk_size = max(1, chunk_size)
+        self.executor = None
+        self.lock = threading.Lock()
+        
+        # 통계
+        self.batches = 0
+        self.labels = 0
+        self.fallbacks = 0
+    
+    def start(self):
+        """작업 프로세스 준비 (spawn - 모든 OS에서 같은 방식, 스레드가 있는 부모를 fork하지 않음)"""
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=init_render_worker,
+                    initargs=(self.specs,)
+                )
+            # 첫 일괄 작업 전에 작업 프로세스를 미리 띄워 초기화 비용을 숨김
+            for _ in range(self.max_workers):
+                self.executor.submit(render_in_worker, next(iter(self.specs)), [])
+    
+    def accepts(self, count):
+        """이 크기의 작업을 작업 프로세스로 보낼지 여부"""
+        return self.executor is not None and count >= self.min_batch
+    
+    def render(self, key, labels):
+        """라벨 목록 생성 → 항목별 (페이로드 또는 None, 오류 메시지) - 접수 순서 유지
+        
+        작업 프로세스 자체가 실패하면 예외를 그대로 올린다 (호출 쪽에서 같은 프로세스로 재시도).
+        """
+        chunks = [labels[i:i + self.chunk_size] for i in range(0, len(labels), self.chunk_size)]
+        results = []
+        try:
+            for chunk_results in self.executor.map(render_in_worker, [key] * len(chunks), chunks):
+                results.extend(chunk_results)
+        except BrokenProcessPool:
+            # 작업 프로세스가 죽음 → 다음 작업을 위해 새로 준비
+            with self.lock:
+                self.fallbacks += 1
+                self.executor.shutdown(wait=False)
+                self.executor = None
+            self.start()
+            raise
+        
+        with self.lock:
+            self.batches += 1
+            self.labels += len(labels)
+        return [
+            (PackedBitmap(*payload) if isinstance(payload, tuple) else payload, error)
+            for payload, error in results
+        ]
+    
+    def reload(self, specs):
+        """프린터 설정 변경 반영 - 새 설정으로 작업 프로세스를 다시 준비 (진행 중인 생성은 이전 프로세스에서 마무리)"""
+        with self.lock:
+            self.specs = specs
+            previous, self.executor = self.executor, None
+        if previous is not None:
+            previous.shutdown(wait=False)
+            self.start()
+    
+    def stats(self):
+        with self.lock:
+            return {
+                'workers': self.max_workers,
+                'min_batch': self.min_batch,
+                'batches': self.batches,
+                'labels': self.labels,
+                'fallbacks': self.fallbacks,
+            }
+    
+    def stop(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+
+
+class ExpiringTable:
+    """시간/개수 제한 테이블 - 보관 시간이 지나거나 개수를 넘으면 오래된 항목부터 제거"""
+    
+    def __init__(self, ttl=30.0, max_entries=1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key → (저장 시각, 값), 저장 순서 유지
+        self.lock = threading.Lock()
+    
+    def purge(self, now=None):
+        """만료된 항목 제거 (lock 보유 상태에서 호출)"""
+        now = time.monotonic() if now is None else now
+        while self.entries:
+            key, (stored_at, _) = next(iter(self.entries.items()))
+            if now - stored_at < self.ttl and len(self.entries) <= self.max_entries:
+                break
+            self.entries.popitem(last=False)
+    
+    def get(self, key):
+        """조회 (없거나 만료되면 None)"""
+        with self.lock:
+            self.purge()
+            entry = self.entries.get(key)
+            return None if entry is None else entry[1]
+    
+    def put(self, key, value):
+        """저장 (같은 키는 새 시각으로 갱신)"""
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = (time.monotonic(), value)
+            self.purge()
+    
+    def __len__(self):
+        with self.lock:
+            self.purge()
+            return len(self.entries)
+
+
+class Metrics:
+    """단계별 지연 시간 / 카운터 집계
+    
+    지연 시간은 단계별로 최근 window개 표본을 보관해 p50/p95/p99를 계산하고,
+    누적 합계/건수는 전체 기간 기준으로 유지한다. (monotonic 시계 기준 초 단위)
+    """
+    
+    QUANTILES = (0.5, 0.95, 0.99)
+    
+    def __init__(self, window=1024):
+        self.window = window
+        self.lock = threading.Lock()
+        self.samples = {}   # stage → deque(최근 표본)
+        self.sums = {}      # stage → 누적 시간
+        self.counts = {}    # stage → 누적 건수
+        self.counters = {}  # name → 값
+        self.gauges = {}    # name → (값을 돌려주는 함수, 라벨 이름)
+    
+    def observe(self, stage, seconds):
+        """단계 소요 시간 기록"""
+        with self.lock:
+            samples = self.samples.get(stage)
+            if samples is None:
+                samples = self.samples[stage] = deque(maxlen=self.window)
+                self.sums[stage] = 0.0
+                self.counts[stage] = 0
+            samples.append(seconds)
+            self.sums[stage] += seconds
+            self.counts[stage] += 1
+    
+    @contextmanager
+    def timer(self, stage):
+        """with 블록 소요 시간 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+    
+    def inc(self, name, value=1):
+        """카운터 증가"""
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+    
+    def add_gauge(self, name, func, label=None):
+        """게이지 등록 (조회 시점에 func() 값 사용, label을 주면 func()는 {라벨 값: 값})"""
+        self.gauges[name] = (func, label)
+    
+    @staticmethod
+    def quantile(sorted_samples, q):
+        if not sorted_samples:
+            return 0.0
+        index = min(len(sorted_samples) - 1, int(round(q * (len(sorted_samples) - 1))))
+        return sorted_samples[index]
+    
+    def summary(self):
+        """단계별 분위수 + 카운터"""
+        with self.lock:
+            stages = {}
+            for stage, samples in self.samples.items():
+                ordered = sorted(samples)
+                stages[stage] = {
+                    'count': self.counts[stage],
+                    'sum': self.sums[stage],
+                    **{f"p{int(q * 100)}": self.quantile(ordered, q) for q in self.QUANTILES},
+                }
+            return {'stages': stages, 'counters': dict(self.counters)}
+    
+    def render_prometheus(self, prefix='bixolon'):
+        """Prometheus 텍스트 형식"""
+        summary = self.summary()
+        lines = [
+            f"# HELP {prefix}_stage_seconds Per-stage job latency",
+            f"# TYPE {prefix}_stage_seconds summary",
         ]
+        for stage, values in sorted(summary['stages'].items()):
+            for q in self.QUANTILES:
+                lines.append(f'{prefix}_stage_seconds{{stage="{stage}",quantile="{q}"}} {values[f"p{int(q * 100)}"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {values["sum"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {values["count"]}')
         
-        for font_path in font_paths:
-            if os.path.exists(font_path):
+        for name, value in sorted(summary['counters'].items()):
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            lines.append(f"{prefix}_{name} {value}")
+        
+        for name, (func, label) in sorted(self.gauges.items()):
+            try:
+                value = func()
+            except Exception:
+                continue
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            if label is None:
+                lines.append(f"{prefix}_{name} {value}")
+                continue
+            for key, item in sorted(value.items()):
+                lines.append(f'{prefix}_{name}{{{label}="{key}"}} {item}')
+        
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """로컬 HTTP /metrics 엔드포인트 (Prometheus 텍스트 형식)"""
+    
+    def __init__(self, metrics, host='127.0.0.1', port=9180):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.httpd = None
+    
+    def start(self):
+        """백그라운드 스레드에서 HTTP 서버 시작"""
+        metrics = self.metrics
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass  # 창 모드(exe)에서는 stderr가 없음
+        
+        self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        thread = threading.Thread(target=self.httpd.serve_forever, name='MetricsServer')
+        thread.daemon = True
+        thread.start()
+    
+    def stop(self):
+        """HTTP 서버 종료"""
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+
+
+class PrinterNotReady(Exception):
+    """프린터가 출력할 수 없는 상태 (오프라인 / 라벨 없음 / 일시 중지 등)"""
+
+
+class PrintJob:
+    """인쇄 작업 (라벨 1건 이상, 큐 대기 시간 기록용)"""
+    
+    def __init__(self, labels):
+        self.id = uuid.uuid4().hex
+        self.labels = labels
+        self.enqueued_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self.error = None       # 출력 오류 메시지 (프린터 장애 판단용)
+        self.future = Future()  # 인쇄 결과 (라벨별 True/False 목록)
+        self.journaled = None   # 저널 기록 커밋 완료 (Future, 저널을 쓸 때만)
+    
+    @property
+    def wait_time(self):
+        """큐 대기 시간 (초)"""
+        if self.started_at is None:
+            return time.monotonic() - self.enqueued_at
+        return self.started_at - self.enqueued_at
+
+
+class PrintQueue:
+    """인쇄 작업 큐 - 프린터 하나를 생성/전송 2단계 파이프라인으로 처리
+    
+    생성 워커가 라벨을 만들어 크기가 pipeline_depth인 버퍼에 넣으면, 전송 워커가 꺼내 프린터로 보낸다.
+    앞 작업이 전송되는 동안 다음 작업을 미리 만들어 두므로, 연속 인쇄 시 처리량은
+    두 단계 시간의 합이 아니라 더 느린 단계에 맞춰진다. 순서는 접수 순서 그대로.
+    pipeline_depth가 0이면 한 워커가 생성과 전송을 차례로 처리한다.
+    프린터가 준비되지 않은 동안(ready 해제, HealthMonitor가 관리) 전송 워커는
+    hold_timeout초까지 기다리고, 그래도 준비되지 않으면 작업을 실패 처리한다.
+    설정 변경으로 프린터를 바꿀 때는 replace_printer()로 예약하면 생성 워커가 작업 사이에 교체하고,
+    이미 생성된 작업은 생성한 프린터로 전송한 뒤 이전 백엔드를 닫는다.
+    """
+    
+    STAGES = ('render', 'spool')
+    IDLE_POLL = 0.5  # 대기 중에도 예약된 프린터 교체를 적용하는 간격 (초)
+    
+    def __init__(self, printer, max_size=20, name='PrinterWorker', pipeline_depth=2):
+        self.printer = printer
+        self.max_size = max_size
+        self.name = name
+        self.pipeline_depth = pipeline_depth
+        self.jobs = queue.Queue(maxsize=max_size)
+        self.rendered = queue.Queue(maxsize=max(1, pipeline_depth))  # 생성 완료 → 전송 대기
+        self.next_printer = None  # 교체 예약된 프린터 (설정 다시 읽기)
+        self.running = False
+        self.workers = []
+        
+        # 프린터 준비 상태 (해제되면 전송 대기)
+        self.ready = threading.Event()
+        self.ready.set()
+        self.hold_timeout = 0.0
+        
+        # 통계
+        self.lock = threading.Lock()
+        self.processed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.started = None
+        self.busy = dict.fromkeys(self.STAGES, 0.0)  # 단계별 작업 시간 합계 (가동률 계산용)
+    
+    def start(self):
+        """프린터 워커 시작 (생성/전송 단계별 스레드)"""
+        self.running = True
+        self.started = time.monotonic()
+        targets = [(self._render, 'Render')]
+        if self.pipeline_depth > 0:
+            targets.append((self._spool, 'Spool'))
+        for target, stage in targets:
+            worker = threading.Thread(target=target, name=f'{self.name}-{stage}')
+            worker.daemon = True
+            worker.start()
+            self.workers.append(worker)
+    
+    def submit(self, labels, client=None):
+        """작업 등록 (큐가 가득 차면 queue.Full 발생, client는 PrinterPool과 인터페이스를 맞추기 위한 인자)"""
+        job = PrintJob(labels)
+        try:
+            self.jobs.put_nowait(job)
+        except queue.Full:
+            with self.lock:
+                self.rejected += 1
+            self.printer.metrics.inc('queue_rejected_total')
+            self.printer.logger.warning(f"⛔ 인쇄 큐 가득 참 ({self.max_size}건) - 작업 거부")
+            raise
+        return job
+    
+    def depth(self):
+        """현재 대기 중인 작업 수 (생성 대기 + 전송 대기)"""
+        return self.jobs.qsize() + self.rendered.qsize()
+    
+    def is_full(self, labels=None, client=None):
+        """큐가 가득 찼는지 여부"""
+        return self.jobs.full()
+    
+    def check_ready(self, labels=None, client=None):
+        """PrinterPool과 인터페이스를 맞추기 위한 메서드 (단일 큐는 준비 상태로 거부하지 않음)"""
+        pass
+    
+    def utilization(self):
+        """단계별 가동률 (시작 이후 작업 시간 비율, 0~1)"""
+        elapsed = time.monotonic() - self.started if self.started else 0.0
+        with self.lock:
+            return {stage: min(1.0, busy / elapsed) if elapsed else 0.0 for stage, busy in self.busy.items()}
+    
+    def stats(self):
+        """큐 통계"""
+        utilization = self.utilization()
+        with self.lock:
+            processed = self.processed
+            return {
+                'depth': self.depth(),
+                'max_size': self.max_size,
+                'processed': processed,
+                'rejected': self.rejected,
+                'avg_wait': self.total_wait / processed if processed else 0.0,
+                'max_wait': self.max_wait,
+                'utilization': utilization,
+            }
+    
+    @contextmanager
+    def stage(self, name):
+        """단계 작업 시간 누적"""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.busy[name] += time.monotonic() - started
+    
+    def replace_printer(self, printer):
+        """프린터 교체 예약 (생성 워커가 다음 작업 전에 적용)"""
+        with self.lock:
+            self.next_printer = printer
+    
+    def apply_printer(self):
+        """예약된 프린터로 교체 - 생성 워커에서만 호출 (이전 백엔드는 남은 전송이 끝난 뒤 닫음)"""
+        with self.lock:
+            printer, self.next_printer = self.next_printer, None
+        if printer is None:
+            return
+        previous, self.printer = self.printer, printer
+        if self.pipeline_depth > 0:
+            self.rendered.put((None, None, previous))
+        else:
+            previous.backend.close()
+    
+    def _render(self):
+        """생성 워커 - 큐에서 작업을 꺼내 라벨 생성 후 전송 단계로 넘김"""
+        while self.running:
+            self.apply_printer()
+            try:
+                job = self.jobs.get(timeout=self.IDLE_POLL)
+            except queue.Empty:
+                continue
+            if job is None:  # 종료 신호
+                break
+            
+            job.started_at = time.monotonic()
+            wait = job.wait_time
+            with self.lock:
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            self.printer.metrics.observe('queue_wait', wait)
+            self.printer.logger.info(f"⏳ 큐 대기 시간: {wait:.3f}s (남은 작업: {self.depth()}건)")
+            
+            try:
+                with self.stage('render'):
+                    rendered = self.printer.render_labels(job.labels)
+            except Exception as e:
+                self.printer.logger.error(f"워커 처리 오류: {e}")
+                rendered = e
+            
+            if self.pipeline_depth > 0:
+                self.rendered.put((job, rendered, self.printer))
+            else:
+                self.spool_job(job, rendered, self.printer)
+        
+        self.rendered.put(None)  # 전송 워커 종료 신호
+    
+    def _spool(self):
+        """전송 워커 - 생성된 라벨을 접수 순서대로 프린터로 보냄"""
+        while True:
+            item = self.rendered.get()
+            if item is None:  # 종료 신호
+                break
+            job, rendered, printer = item
+            if job is None:  # 교체된 프린터 - 앞선 작업 전송이 끝났으므로 정리
+                printer.backend.close()
+                continue
+            self.spool_job(job, rendered, printer)
+    
+    def spool_job(self, job, rendered, printer=None):
+        """생성된 작업 인쇄 → 결과 전달 (printer: 작업을 생성한 프린터)"""
+        printer = printer or self.printer
+        if not isinstance(rendered, Exception) and not self.wait_ready():
+            rendered = PrinterNotReady("프린터 준비 안 됨")
+        
+        # 인쇄 시작 시그널 → 생성 단계 결과 (생성 단계는 다음 작업을 미리 처리하므로 다이얼로그를 연 뒤 작업별로 표시)
+        self.printer.signals.start_printing.emit()
+        if not isinstance(rendered, Exception):
+            self.printer.signals.update_status.emit("🎨 라벨 이미지 생성 완료")
+        
+        if isinstance(rendered, Exception):
+            results = [False] * len(job.labels)
+            job.error = str(rendered)
+        else:
+            try:
+                with self.stage('spool'):
+                    results = printer.spool_labels(job.labels, rendered)
+                job.error = printer.last_error
+            except Exception as e:
+                self.printer.logger.error(f"워커 처리 오류: {e}")
+                results = [False] * len(job.labels)
+                job.error = str(e)
+        
+        job.finished_at = time.monotonic()
+        self.printer.metrics.observe('total', job.finished_at - job.enqueued_at)
+        with self.lock:
+            self.processed += 1
+        job.future.set_result(results)
+        
+        # 인쇄 완료 시그널 (다이얼로그 표시 시간은 UI 쪽에서 보장)
+        self.printer.signals.finish_printing.emit()
+    
+    def wait_ready(self):
+        """프린터 준비까지 hold_timeout초 대기 → 준비 여부 (종료 중이면 False)"""
+        if not self.ready.is_set():
+            if self.hold_timeout > 0:
+                self.printer.logger.warning(f"⏸️ 프린터 준비 안 됨 - 최대 {self.hold_timeout:g}초 보류")
+            self.ready.wait(self.hold_timeout)
+        return self.ready.is_set() and self.running
+    
+    def stop(self):
+        """워커 종료 (대기 중인 작업은 실패 처리)"""
+        self.running = False
+        self.ready.set()  # 보류 중인 전송 워커 깨움
+        for pending in (self.jobs, self.rendered):
+            while True:
                 try:
-                    return ImageFont.truetype(font_path, 18)
-                except:
-                    continue
+                    item = pending.get_nowait()
+                except queue.Empty:
+                    break
+                job = item[0] if isinstance(item, tuple) else item
+                if job is None and isinstance(item, tuple):  # 교체된 프린터
+                    item[2].backend.close()
+                elif job is not None and not job.future.done():
+                    job.future.set_result([False] * len(job.labels))
+        try:
+            self.jobs.put_nowait(None)
+        except queue.Full:
+            pass
+
+
+class JobJournal:
+    """인쇄 작업 저널 (SQLite WAL) - 접수한 작업을 기록하고 완료 시 표시, 재시작 시 미완료 작업 재인쇄
+    
+    기록/완료 표시는 큐에 넣기만 하고, 기록 스레드가 commit_interval 동안 모인 것을
+    한 트랜잭션으로 커밋한다 (fsync를 묶어서 처리량 손실을 줄임).
+    종료 중 중단된 작업은 완료로 표시하지 않으므로 다음 시작 때 다시 인쇄된다 (최소 1회 인쇄).
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            created REAL NOT NULL,
+            client TEXT,
+            labels TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            finished REAL
+        )
+    """
+    STATEMENTS = {
+        'add': "INSERT OR IGNORE INTO jobs (id, created, client, labels) VALUES (?, ?, ?, ?)",
+        'finish': "UPDATE jobs SET status = ?, finished = ? WHERE id = ?",
+        'discard': "DELETE FROM jobs WHERE id = ?",
+    }
+    
+    def __init__(self, path='data/journal.db', commit_interval=0.02, max_batch=256, retention_hours=24):
+        self.path = path
+        self.commit_interval = commit_interval
+        self.max_batch = max_batch
+        self.ops = queue.Queue()
+        self.closing = False
+        self.writer = None
+        
+        # 통계
+        self.replayed = 0
+        self.commits = 0
+        self.writes = 0
+        
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        
+        # 준비: WAL 설정, 오래된 완료 기록 정리, 미완료 작업 읽기
+        conn = self.connect()
+        try:
+            with conn:
+                conn.execute(self.SCHEMA)
+                conn.execute(
+                    "DELETE FROM jobs WHERE status != 'pending' AND finished < ?",
+                    (time.time() - retention_hours * 3600,)
+                )
+            self.pending = [
+                (job_id, json.loads(labels), client)
+                for job_id, labels, client in conn.execute(
+                    "SELECT id, labels, client FROM jobs WHERE status = 'pending' ORDER BY created"
+                )
+            ]
+            self.pending_at_start = len(self.pending)
+        finally:
+            conn.close()
+    
+    def connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")  # 커밋마다 fsync (그룹 커밋으로 횟수를 줄임)
+        return conn
+    
+    def start(self):
+        """기록 스레드 시작"""
+        self.writer = threading.Thread(target=self._run, name='JournalWriter')
+        self.writer.daemon = True
+        self.writer.start()
+    
+    def add(self, job_id, labels, client=None):
+        """접수한 작업 기록 → 커밋되면 True가 설정되는 Future (기록 실패 시 False)"""
+        committed = Future()
+        self.ops.put(('add', (job_id, time.time(), client, json.dumps(labels, ensure_ascii=False)), committed))
+        return committed
+    
+    def finish(self, job_id, success):
+        """작업 완료 표시 (종료 중 중단된 작업은 다음 시작 때 재인쇄하도록 그대로 둠)"""
+        if self.closing:
+            return
+        self.ops.put(('finish', ('done' if success else 'failed', time.time(), job_id), None))
+    
+    def discard(self, job_id):
+        """접수하지 못한 작업 기록 삭제"""
+        self.ops.put(('discard', (job_id,), None))
+    
+    def lookup(self, job_id):
+        """기록된 작업 상태 (pending / done / failed, 없으면 None) - 재시작 전에 접수한 작업 조회용"""
+        conn = sqlite3.connect(self.path)
+        try:
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+    
+    def depth(self):
+        """커밋 대기 중인 기록 수"""
+        return self.ops.qsize()
+    
+    def stats(self):
+        return {
+            'pending_at_start': self.pending_at_start,
+            'replayed': self.replayed,
+            'commits': self.commits,
+            'writes': self.writes,
+            'backlog': self.depth(),
+        }
+    
+    def _run(self):
+        """기록 루프 - 모인 기록을 한 번에 커밋"""
+        conn = self.connect()
+        running = True
+        while running:
+            op = self.ops.get()
+            if op is None:
+                break
+            batch = [op]
+            deadline = time.monotonic() + self.commit_interval
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    op = self.ops.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if op is None:
+                    running = False
+                    break
+                batch.append(op)
+            
+            try:
+                with conn:
+                    for kind, args, _ in batch:
+                        conn.execute(self.STATEMENTS[kind], args)
+                self.commits += 1
+                self.writes += len(batch)
+                committed = True
+            except sqlite3.Error as e:
+                logging.getLogger('BixolonPrinter').error(f"✗ 작업 저널 기록 실패 ({len(batch)}건): {e}")
+                committed = False
+            for _, _, future in batch:
+                if future is not None:
+                    future.set_result(committed)
+        conn.close()
+    
+    def replay(self, pool, retry_interval=5.0):
+        """시작 전 미완료 작업을 다시 인쇄
         
-        # 기본 폰트 사용
-        return ImageFont.load_default()
+        큐에 자리가 있고 후보 프린터가 준비됐을 때 순서대로 등록한다. 기다리는 클라이언트가 없으므로
+        프린터 오류로 실패한 작업은 미완료로 남겨 두고, retry_interval 뒤 프린터가 준비되면 다시 보낸다.
+        """
+        logger = pool.logger
+        if self.pending:
+            logger.warning(f"💾 미완료 작업 {len(self.pending)}건 재인쇄")
+        entries = self.pending
+        while entries and not self.closing:
+            submitted = []
+            retry = []
+            for job_id, labels, client in entries:
+                while (pool.is_full(labels, client) or not pool.ready(labels, client)) and not self.closing:
+                    time.sleep(0.05)
+                if self.closing:
+                    return
+                try:
+                    submitted.append(((job_id, labels, client), pool.submit(labels, client, job_id=job_id)))
+                except queue.Full:  # 확인 직후 다른 요청이 자리를 차지함 → 다음 차례에 다시 시도
+                    retry.append((job_id, labels, client))
+            
+            entries = retry
+            for entry, job in submitted:
+                while not job.future.done() and not self.closing:
+                    time.sleep(0.05)
+                if self.closing:
+                    return
+                if job.error is not None:
+                    entries.append(entry)
+                else:
+                    self.replayed += 1
+            if entries:
+                logger.warning(f"💾 재인쇄하지 못한 작업 {len(entries)}건 - 미완료로 두고 프린터 준비 후 다시 시도")
+                deadline = time.monotonic() + retry_interval
+                while time.monotonic() < deadline and not self.closing:
+                    time.sleep(0.05)
+        self.pending = []
+    
+    def close(self):
+        """남은 기록을 커밋하고 종료"""
+        self.closing = True
+        if self.writer is not None:
+            self.ops.put(None)
+            self.writer.join(5.0)
+
+
+class PoolMember:
+    """프린터 풀 구성원 (프린터 + 전용 작업 큐 + 상태/통계)"""
+    
+    def __init__(self, member_id, printer, print_queue):
+        self.id = member_id
+        self.printer = printer
+        self.queue = print_queue
+        self.outstanding = 0        # 등록 후 아직 끝나지 않은 작업 수 (부하 기준)
+        self.failures = 0           # 연속 출력 실패 수
+        self.unhealthy_until = 0.0  # 이 시각(monotonic)까지 분배 대상에서 제외
+        self.last_error = None
+        self.status = PrinterStatus(True, 'unknown', '')  # 마지막 상태 조회 결과 (HealthMonitor)
+        
+        # 통계
+        self.jobs = 0
+        self.labels_printed = 0
+        self.labels_failed = 0
+        self.failovers = 0          # 이 프린터의 오류로 다른 프린터에 넘긴 작업 수
     
-    def create_qr_code(self, data, size=200):
-        """QR 코드 이미지 생성"""
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=2,
-        )
-        qr.add_data(data)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white")
-        img = img.resize((size, size), Image.Resampling.LANCZOS)
-        return img
+    def healthy(self, now=None):
+        """분배 가능 여부 (장애 후 재시도 대기 중이거나 프린터가 준비되지 않았으면 False)"""
+        return self.status.ready and (time.monotonic() if now is None else now) >= self.unhealthy_until
     
-    def create_label_image(self, data):
-        """라벨 이미지 생성 (QR 코드 + 텍스트 정보)"""
-        # 용지 크기: 55mm x 32mm
-        # 203 DPI 기준: 55mm = 439 픽셀, 32mm = 255 픽셀
-        label_width = 800   # 55mm (203 DPI 기준)
-        label_height = 240  # 32mm (203 DPI 기준)
-        qr_size = 132       # QR 코드 크기 (라벨 높이보다 작게!)
-        
-        # 배경 이미지 생성
-        label = Image.new('RGB', (label_width, label_height), 'white')
-        draw = ImageDraw.Draw(label)
+    def stats(self):
+        utilization = self.queue.utilization()
+        session = self.printer.backend.stats()
+        return {
+            'printer': self.printer.printer_name,
+            'healthy': self.healthy(),
+            'ready': self.status.ready,
+            'state': self.status.state,
+            'depth': self.queue.depth(),
+            'outstanding': self.outstanding,
+            'jobs': self.jobs,
+            'labels_printed': self.labels_printed,
+            'labels_failed': self.labels_failed,
+            'failovers': self.failovers,
+            'render_utilization': utilization['render'],
+            'spool_utilization': utilization['spool'],
+            'session_opens': session.get('opens', 0),
+            'session_reuses': session.get('reuses', 0),
+            'session_stale': session.get('stale', 0),
+            'last_error': self.last_error,
+        }
+
+
+class PrinterPool:
+    """프린터 풀 - 프린터마다 작업 큐/워커를 두고 요청을 분배
+    
+    라우팅 규칙(소속 / 클라이언트 대역)에 맞는 프린터 중 정상이면서 미완료 작업이
+    가장 적은 프린터로 보낸다. 일치하는 규칙이 없으면 전체 프린터가 후보.
+    출력 오류가 unhealthy_after번 이어지면 retry_after초 동안 분배에서 빼고,
+    실패한 작업은 아직 시도하지 않은 다른 후보 프린터로 다시 보낸다 (failover).
+    reject_not_ready가 참이면 후보 프린터가 모두 준비되지 않았을 때 새 작업을 바로 거부한다.
+    PrintQueue와 같은 submit / depth / is_full / stats / stop 인터페이스를 제공한다.
+    """
+    
+    def __init__(self, members, rules=None, failover=True, unhealthy_after=1, retry_after=30.0, journal=None):
+        if not members:
+            raise ValueError("프린터가 하나 이상 필요합니다")
+        self.members = members
+        self.by_id = {member.id: member for member in members}
+        self.rules = [self.compile_rule(rule) for rule in rules or []]
+        self.failover = failover
+        self.unhealthy_after = max(1, unhealthy_after)
+        self.retry_after = retry_after
+        self.journal = journal  # 작업 저널 (없으면 기록 안 함)
+        self.reject_not_ready = False  # HealthMonitor가 reject 정책일 때 설정
+        self.lock = threading.Lock()
+        
+        # 로그/지표는 모든 프린터가 공유
+        self.logger = members[0].printer.logger
+        self.metrics = members[0].printer.metrics
+    
+    def compile_rule(self, rule):
+        """라우팅 규칙 {"department": ..., "subnet": ..., "printers": [...]} 준비"""
+        def as_list(value):
+            if value is None:
+                return []
+            return [value] if isinstance(value, str) else list(value)
+        
+        printers = []
+        for member_id in as_list(rule.get('printers')):
+            if member_id not in self.by_id:
+                raise ValueError(f"라우팅 규칙의 프린터를 찾을 수 없습니다: {member_id}")
+            printers.append(self.by_id[member_id])
+        if not printers:
+            raise ValueError(f"라우팅 규칙에 프린터가 없습니다: {rule}")
+        
+        return {
+            'departments': {str(department).strip() for department in as_list(rule.get('department'))},
+            'subnets': [ipaddress.ip_network(subnet, strict=False) for subnet in as_list(rule.get('subnet'))],
+            'printers': printers,
+        }
+    
+    @staticmethod
+    def client_address(client):
+        """클라이언트 주소 문자열 → ip_address (IPv4 매핑 IPv6는 IPv4로, 알 수 없으면 None)"""
+        if not client:
+            return None
+        try:
+            address = ipaddress.ip_address(client)
+        except ValueError:
+            return None
+        if address.version == 6 and address.ipv4_mapped:
+            return address.ipv4_mapped
+        return address
+    
+    def candidates(self, labels=None, client=None):
+        """라우팅 규칙에 따른 후보 프린터 (첫 번째로 일치하는 규칙, 없으면 전체)
         
-        # QR 코드 생성 및 배치 (왼쪽, 위아래 여백 5픽셀)
-        qr_data = data.get('qr_data', 'NO DATA')
-        qr_img = self.create_qr_code(qr_data, size=qr_size)
-        qr_x = 220  # 왼쪽 여백
-        qr_y = (label_height - qr_size) // 2  # 세로 중앙
-        label.paste(qr_img, (qr_x, qr_y))
+        규칙에 적힌 조건은 모두 맞아야 하며, 일괄 요청은 첫 라벨의 소속으로 판단한다.
+        """
+        first = labels[0] if labels and isinstance(labels[0], dict) else {}
+        department = str(first.get('department') or '').strip()
+        address = self.client_address(client)
         
-        # 텍스트 정보 추가 (QR 오른쪽)
-        text_start_x = qr_x + qr_size + 30  # QR 코드 오른쪽
+        for rule in self.rules:
+            if rule['departments'] and department not in rule['departments']:
+                continue
+            if rule['subnets'] and (address is None or not any(address in subnet for subnet in rule['subnets'])):
+                continue
+            return rule['printers']
+        return self.members
+    
+    def select(self, candidates, exclude=()):
+        """정상 후보 중 큐에 자리가 있으면서 가장 한가한 프린터
         
-        # 폰트 생성
-        try:
-            small_font = ImageFont.truetype("C:\\Windows\\Fonts\\malgun.ttf", 24)
-        except:
+        정상 후보가 하나도 없을 때만 장애 / 준비 안 된 프린터도 시도한다.
+        정상 후보의 큐가 가득 찬 것뿐이면 None (호출 쪽의 대기 / 거부에 맡김).
+        """
+        now = time.monotonic()
+        remaining = [member for member in candidates if member not in exclude]
+        healthy = [member for member in remaining if member.healthy(now)]
+        available = [member for member in healthy or remaining if not member.queue.is_full()]
+        # 부하가 같으면 설정에 먼저 적힌 프린터
+        return min(available, key=lambda member: member.outstanding, default=None)
+    
+    def dispatch(self, job, candidates, tried=()):
+        """작업을 선택한 프린터 큐에 등록 (등록할 곳이 없으면 False)"""
+        with self.lock:
+            member = self.select(candidates, tried)
+            if member is None:
+                return False
             try:
-                small_font = ImageFont.truetype("C:\\Windows\\Fonts\\gulim.ttc", 24)
-            except:
-                small_font = self.font
-        
-        text_items = [
-            f"이름: {data.get('name', '')}",
-            f"사번: {data.get('employee_id', '')}",
-            f"소속: {data.get('department', '')}",
-            f"발급: {data.get('issue_date', datetime.now().strftime('%Y-%m-%d'))}",
-        ]
+                inner = member.queue.submit(job.labels)
+            except queue.Full:
+                return False
+            member.outstanding += 1
+        
+        job.printer_id = member.id
+        inner.future.add_done_callback(
+            lambda future: self.finish(job, member, inner, candidates, tried + (member,))
+        )
+        return True
+    
+    def finish(self, job, member, inner, candidates, tried):
+        """프린터 작업 완료 (해당 워커 스레드) - 상태 갱신 후 결과 전달 또는 다른 프린터로 재전송"""
+        results = inner.future.result()
+        printed = sum(1 for success in results if success)
+        became_unhealthy = recovered = False
+        
+        with self.lock:
+            member.outstanding -= 1
+            member.jobs += 1
+            member.labels_printed += printed
+            member.labels_failed += len(results) - printed
+            if inner.error is None:
+                recovered = member.failures >= self.unhealthy_after
+                member.failures = 0
+                member.unhealthy_until = 0.0
+                member.last_error = None
+            else:
+                member.failures += 1
+                member.last_error = inner.error
+                if member.failures >= self.unhealthy_after:
+                    became_unhealthy = member.healthy()
+                    member.unhealthy_until = time.monotonic() + self.retry_after
+        
+        if recovered:
+            self.logger.info(f"✅ 프린터 복구: {member.id}")
+        if became_unhealthy:
+            self.metrics.inc('printer_unhealthy_total')
+            self.logger.warning(f"🚧 프린터 장애: {member.id} - {self.retry_after:.0f}초 동안 분배 제외 ({inner.error})")
+        
+        if inner.error is not None and self.failover and self.dispatch(job, candidates, tried):
+            with self.lock:
+                member.failovers += 1
+            self.metrics.inc('failovers_total')
+            self.logger.warning(f"🔁 {member.id} 출력 실패 → {job.printer_id} 프린터로 다시 전송")
+            return
         
-        # 텍스트 전체 높이 계산
-        line_height = 55
-        total_text_height = len(text_items) * line_height - line_height//2  # 마지막 줄 간격 제외
-        text_start_y = (label_height - total_text_height) // 2  # 세로 중앙 정렬
+        # 전체 성공/실패는 작업이 최종 결과로 끝날 때 한 번만 집계 (다른 프린터로 넘긴 시도는 프린터별 통계에만)
+        self.metrics.inc('labels_printed_total', printed)
+        self.metrics.inc('labels_failed_total', len(results) - printed)
         
-        y_position = text_start_y
-        for text in text_items:
-            draw.text((text_start_x, y_position), text, fill='black', font=small_font)
-            y_position += line_height
+        job.started_at = inner.started_at
+        job.finished_at = inner.finished_at
+        job.error = inner.error
+        job.future.set_result(results)
+    
+    def start(self):
+        """모든 프린터 워커 시작"""
+        for member in self.members:
+            member.queue.start()
+    
+    def ready(self, labels=None, client=None):
+        """후보 프린터 중 준비된 프린터가 있는지 여부 (상태 감시를 쓰지 않으면 항상 True)"""
+        return any(member.status.ready for member in self.candidates(labels, client))
+    
+    def check_ready(self, labels=None, client=None):
+        """후보 프린터가 모두 준비되지 않았으면 PrinterNotReady 발생 (reject_not_ready일 때만)"""
+        if not self.reject_not_ready or self.ready(labels, client):
+            return
+        candidates = self.candidates(labels, client)
+        states = ', '.join(f"{member.id}: {PRINTER_STATE_TEXT.get(member.status.state, member.status.state)}"
+                           for member in candidates)
+        self.metrics.inc('not_ready_rejected_total')
+        self.logger.warning(f"⛔ 프린터 준비 안 됨 - 작업 거부 ({states})")
+        raise PrinterNotReady(states)
+    
+    def submit(self, labels, client=None, job_id=None):
+        """작업 등록 → 전체 결과를 담을 PrintJob (후보 프린터 큐가 모두 가득 차면 queue.Full 발생)
         
-        return label
+        저널이 있으면 등록 전에 기록하고, 끝나면 완료로 표시한다 (job_id는 재인쇄 시 기존 기록 ID).
+        새 작업은 후보 프린터가 모두 준비되지 않았으면 PrinterNotReady 발생 (재인쇄 작업은 그대로 등록).
+        """
+        if job_id is None:
+            self.check_ready(labels, client)
+        job = PrintJob(labels)
+        job.printer_id = None
+        job.id = job_id or job.id
+        if self.journal is not None:
+            job.journaled = self.journal.add(job.id, labels, client)
+        
+        if not self.dispatch(job, self.candidates(labels, client)):
+            if self.journal is not None and job_id is None:
+                self.journal.discard(job.id)
+            self.metrics.inc('queue_rejected_total')
+            self.logger.warning("⛔ 모든 후보 프린터의 인쇄 큐가 가득 참 - 작업 거부")
+            raise queue.Full
+        
+        if self.journal is not None:
+            job.future.add_done_callback(lambda future: self.journal_finish(job, replayed=job_id is not None))
+        return job
     
-    def print_label(self, data):
-        """라벨 인쇄"""
+    def journal_finish(self, job, replayed=False):
+        """저널에 완료 표시 (프린터 오류로 실패한 재인쇄 작업은 미완료로 두어 JobJournal.replay가 다시 시도)"""
+        success = all(job.future.result())
+        if replayed and not success and job.error is not None:
+            return
+        self.journal.finish(job.id, success)
+    
+    def depth(self):
+        """전체 대기 중인 작업 수"""
+        return sum(member.queue.depth() for member in self.members)
+    
+    def is_full(self, labels=None, client=None):
+        """요청을 받을 후보 프린터 큐가 모두 가득 찼는지 여부 (정상 후보가 있으면 정상 후보만 봄)"""
+        candidates = self.candidates(labels, client)
+        now = time.monotonic()
+        healthy = [member for member in candidates if member.healthy(now)]
+        return all(member.queue.is_full() for member in healthy or candidates)
+    
+    def stats(self):
+        """풀 통계 (전체 + 프린터별)"""
+        with self.lock:
+            printers = {member.id: member.stats() for member in self.members}
+        return {
+            'depth': self.depth(),
+            'printers': printers,
+        }
+    
+    def member_values(self, key):
+        """프린터별 통계 값 {프린터 ID: 값} (지표 게이지용)"""
+        values = {member_id: stats[key] for member_id, stats in self.stats()['printers'].items()}
+        return {member_id: int(value) if isinstance(value, bool) else value for member_id, value in values.items()}
+    
+    def stop(self):
+        """모든 워커 종료 후 백엔드 정리"""
+        for member in self.members:
+            member.queue.stop()
+        for member in self.members:
+            member.printer.backend.close()
+
+
+class HealthMonitor:
+    """프린터 상태 감시 - 백그라운드에서 주기적으로 프린터/스풀러 상태를 조회해 캐시
+    
+    상태 조회는 백엔드의 check_status()로 하며, 인쇄 경로의 OpenPrinter/StartDoc이
+    드라이버에서 오래 막히기 전에 준비 안 된 프린터를 알아내기 위한 것이다.
+    policy가 'reject'면 준비되지 않은 동안 새 작업을 997로 바로 거부하고 대기 중인 작업도 바로 실패 처리,
+    'hold'면 작업은 받되 전송 워커가 hold_timeout초까지 프린터 복구를 기다린다.
+    """
+    
+    POLICIES = ('reject', 'hold')
+    
+    def __init__(self, pool, interval=5.0, policy='reject', hold_timeout=60.0):
+        self.pool = pool
+        self.configure(interval, policy, hold_timeout)
+        self.logger = pool.logger
+        self.metrics = pool.metrics
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.checks = 0
+        self.last_check = None
+    
+    def configure(self, interval, policy, hold_timeout):
+        """감시 간격 / 정책 설정 (설정 다시 읽기 때도 사용, 다음 조회부터 반영)"""
+        if policy not in self.POLICIES:
+            raise ValueError(f"지원하지 않는 프린터 상태 정책: {policy}")
+        self.interval = interval
+        self.policy = policy
+        self.hold_timeout = hold_timeout
+        self.pool.reject_not_ready = policy == 'reject'
+        for member in self.pool.members:
+            member.queue.hold_timeout = hold_timeout if policy == 'hold' else 0.0
+    
+    def start(self):
+        """감시 스레드 시작"""
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name='HealthMonitor')
+        self.thread.daemon = True
+        self.thread.start()
+        self.logger.info(f"🩺 프린터 상태 감시 시작 ({self.interval:g}초 간격, {self.policy})")
+    
+    def run(self):
+        while not self.stop_event.is_set():
+            self.check_all()
+            self.stop_event.wait(self.interval)
+    
+    def check_all(self):
+        """모든 프린터 상태 조회 후 캐시 갱신"""
+        for member in self.pool.members:
+            if self.stop_event.is_set():
+                return
+            self.update(member, self.check(member))
+        self.checks += 1
+        self.last_check = time.time()
+    
+    def check(self, member):
+        """프린터 1대 상태 조회 (조회 자체가 실패하면 오류 상태)"""
         try:
-            
-            self.logger.info(f"인쇄 시작 - 데이터: {data}")  # ← 추가
-            
-            self.signals.update_status.emit("🎨 라벨 이미지 생성 중...")
-            time.sleep(0.5)  # UI 업데이트를 위한 짧은 대기
-            
-            # 라벨 이미지 생성
-            label_img = self.create_label_image(data)
-            
-            self.signals.update_status.emit("🔌 프린터 연결 중...")
-            time.sleep(0.3)
-            
-            # Windows 프린터로 인쇄
-            hprinter = win32print.OpenPrinter(self.printer_name)
-            try:
-                hdc = win32ui.CreateDC()
-                hdc.CreatePrinterDC(self.printer_name)
-                
-                self.signals.update_status.emit("🖨️ 인쇄 시작...")
-                
-                hdc.StartDoc("Label Print")
-                hdc.StartPage()
-                
-                # 이미지를 프린터로 전송
-                dib = ImageWin.Dib(label_img)
-                dib.draw(hdc.GetHandleOutput(), (0, 0, label_img.width, label_img.height))
-                
-                hdc.EndPage()
-                hdc.EndDoc()
-                hdc.DeleteDC()
-                
-                self.signals.update_status.emit("✓ 인쇄 완료!")
-                self.logger.info("인쇄 성공")  # ← 추가
-                return True
-                
-            finally:
-                win32print.ClosePrinter(hprinter)
-                
+            with self.metrics.timer('health_check'):
+                return member.printer.backend.check_status()
         except Exception as e:
-            self.signals.update_status.emit(f"❌ 인쇄 오류: {str(e)}")
-            print(f"인쇄 오류: {e}")
-            self.logger.error(f"인쇄 오류: {str(e)}")  # ← 추가
-            return False
+            return PrinterStatus(False, 'error', str(e))
+    
+    def update(self, member, status):
+        """상태 캐시 갱신 + 변경 시 로그 / 전송 대기 상태 반영"""
+        previous = member.status
+        member.status = status
+        if status.ready:
+            member.queue.ready.set()
+        else:
+            member.queue.ready.clear()
+        
+        if status.state == previous.state:
+            return
+        text = PRINTER_STATE_TEXT.get(status.state, status.state)
+        detail = f" ({status.detail})" if status.detail else ""
+        if status.ready:
+            if previous.state != 'unknown':
+                self.logger.info(f"✅ 프린터 준비됨: {member.id} - {text}{detail}")
+        else:
+            self.metrics.inc('printer_not_ready_total')
+            self.logger.warning(f"🚫 프린터 준비 안 됨: {member.id} - {text}{detail}")
+    
+    def summary(self):
+        """전체 상태 요약 문자열 (트레이 툴팁 / 상태 다이얼로그용)"""
+        members = self.pool.members
+        not_ready = [member for member in members if not member.status.ready]
+        if not not_ready:
+            return "정상"
+        if len(members) == 1:
+            return PRINTER_STATE_TEXT.get(not_ready[0].status.state, not_ready[0].status.state)
+        return ', '.join(f"{member.id} {PRINTER_STATE_TEXT.get(member.status.state, member.status.state)}"
+                         for member in not_ready)
+    
+    def stop(self):
+        """감시 종료"""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(5.0)
 
 
 class SocketServer:
-    """소켓 서버 클래스"""
+    """소켓 서버 클래스 (asyncio 기반 - 전용 이벤트 루프 스레드에서 실행)"""
+    
+    # 응답 코드
+    RESPONSE_SUCCESS = "001"
+    RESPONSE_ACCEPTED = "002"   # 비동기 모드: 접수됨 (결과는 상태 조회 또는 콜백으로)
+    RESPONSE_NOT_READY = "997"  # 프린터 준비 안 됨 (오프라인 / 라벨 없음 등) - 즉시 거부
+    RESPONSE_QUEUE_FULL = "998"
+    RESPONSE_FAILURE = "999"
+    
+    # 프레이밍 협상: 첫 줄이 FRAMING_HELLO면 NDJSON 지속 연결 모드 (한 줄 = 요청 1건)
+    # 그 외에는 기존 단발 모드 (JSON 1건 수신 → 응답 → 연결 종료)
+    FRAMING_HELLO = b"NDJSON\n"
+    FRAMING_ACK = b"NDJSON OK\n"
+    MAX_REQUEST_BYTES = 1024 * 1024
+    JOURNAL_TIMEOUT = 5.0  # 비동기 접수 응답 전 저널 커밋 최대 대기 (초)
     
-    def __init__(self, host='127.0.0.1', port=9999, printer=None):
+    def __init__(self, host='127.0.0.1', port=9999, printer=None, print_queue=None,
+                 read_timeout=30.0, idle_timeout=300.0, max_pipeline=32,
+                 max_connections=64, queue_timeout=2.0, shutdown_grace=5.0,
+                 dedup_window=30.0, dedup_max_entries=1000,
+                 job_ttl=3600.0, job_max_entries=10000,
+                 callback_hosts=('127.0.0.1', 'localhost', '::1'), callback_timeout=3.0, callback_retries=2,
+                 journal=None):
         self.host = host
         self.port = port
         self.printer = printer
+        self.print_queue = print_queue
+        self.read_timeout = read_timeout
+        self.idle_timeout = idle_timeout
+        self.max_pipeline = max_pipeline
+        self.max_connections = max_connections
+        self.queue_timeout = queue_timeout
+        self.shutdown_grace = shutdown_grace
         self.running = False
-        self.server_socket = None
+        
+        self.loop = None
+        self.server = None
+        self.stop_event = None
+        self.stopped = threading.Event()
+        self.connections = set()
+        
+        # 최근 요청 (중복 인쇄 방지, dedup_window가 0이면 사용 안 함)
+        self.recent_requests = ExpiringTable(dedup_window, dedup_max_entries) if dedup_window > 0 else None
+        
+        # 비동기 모드 작업 (상태 조회용) + 완료 콜백 (로컬 호스트만 허용)
+        self.jobs = ExpiringTable(job_ttl, job_max_entries)
+        self.callback_hosts = set(callback_hosts)
+        self.callback_timeout = callback_timeout
+        self.callback_retries = callback_retries
+        self.callbacks = ThreadPoolExecutor(max_workers=2, thread_name_prefix='JobCallback')
+        self.journal = journal  # 재시작 전에 접수한 작업 상태 조회용 (없으면 메모리 기록만)
         
     def start(self):
-        """서버 시작"""
+        """서버 시작 (호출한 스레드가 이벤트 루프 스레드가 됨, 종료 시까지 반환하지 않음)"""
+        self.stopped.clear()
+        self.loop = asyncio.new_event_loop()
+        try:
+            self.loop.run_until_complete(self.serve())
+        finally:
+            self.loop.close()
+            self.stopped.set()
+    
+    async def serve(self):
+        """연결 수락 → 종료 요청 시 진행 중인 연결을 마무리하고 정리"""
+        self.stop_event = asyncio.Event()
         self.running = True
-        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         
         try:
-            self.server_socket.bind((self.host, self.port))
-            self.server_socket.listen(5)
+            self.server = await self.listen(self.host, self.port)
             self.printer.logger.info(f"✓ 소켓 서버 시작: {self.host}:{self.port}")  # ← 추가
         except Exception as e:
             print(f"✗ 서버 시작 실패: {e}")
             self.printer.logger.info(f"✗ 서버 시작 실패: {e}")  # ← 추가
+            self.running = False
             return
         
-        while self.running:
+        await self.stop_event.wait()
+        
+        # 새 연결 수락 중지 → 진행 중인 연결은 유예 시간 동안 마무리 → 남은 연결 취소
+        self.server.close()
+        if self.connections:
+            done, pending = await asyncio.wait(set(self.connections), timeout=self.shutdown_grace)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        await self.server.wait_closed()
+    
+    async def listen(self, host, port):
+        """수신 소켓 열기"""
+        return await asyncio.start_server(
+            self.accept_client, host, port,
+            reuse_address=True, limit=self.MAX_REQUEST_BYTES
+        )
+    
+    async def switch_listener(self, host, port):
+        """새 주소로 수신을 시작한 뒤 이전 수신 소켓을 닫음 (진행 중인 연결은 그대로 처리)
+        
+        같은 포트를 다른 주소로 바꿀 때 함께 열 수 없으면 이전 소켓을 먼저 닫고 열며,
+        그래도 실패하면 이전 주소로 되돌린 뒤 예외를 올린다.
+        """
+        previous = self.server
+        try:
+            server = await self.listen(host, port)
+        except OSError:
+            if port != self.port:
+                raise
+            previous.close()
             try:
-                self.server_socket.settimeout(1.0)
-                client_socket, address = self.server_socket.accept()
-                self.printer.logger.info(f"📡 클라이언트 연결: {address}")  # ← 추가
-                # 별도 스레드에서 처리
-                client_thread = threading.Thread(
-                    target=self.handle_client,
-                    args=(client_socket,)
-                )
-                client_thread.daemon = True
-                client_thread.start()
-                
-            except socket.timeout:
-                continue
-            except Exception as e:
-                if self.running:
-                    print(f"서버 오류: {e}")
+                server = await self.listen(host, port)
+            except OSError:
+                self.server = await self.listen(self.host, self.port)
+                raise
+        else:
+            previous.close()
+        self.server = server
+        self.host, self.port = host, port
+    
+    def rebind(self, host, port, timeout=5.0):
+        """수신 주소 변경 (다른 스레드에서 호출, 대기열과 연결은 유지, 실패하면 예외)"""
+        if self.loop is None or self.server is None or not self.running:
+            self.host, self.port = host, port
+            return
+        asyncio.run_coroutine_threadsafe(self.switch_listener(host, port), self.loop).result(timeout)
+    
+    async def accept_client(self, reader, writer):
+        """연결 수 제한 확인 후 클라이언트 처리"""
+        address = writer.get_extra_info('peername')
+        self.printer.logger.info(f"📡 클라이언트 연결: {address}")  # ← 추가
+        
+        self.printer.metrics.inc('connections_total')
+        if len(self.connections) >= self.max_connections:
+            self.printer.metrics.inc('connections_rejected_total')
+            self.printer.logger.warning(f"⛔ 동시 연결 수 초과 ({self.max_connections}) - 연결 거부: {address}")
+            try:
+                writer.write(self.RESPONSE_QUEUE_FULL.encode('utf-8'))
+                await writer.drain()
+            except Exception:
+                pass
+            writer.close()
+            return
+        
+        task = asyncio.current_task()
+        self.connections.add(task)
+        try:
+            await self.handle_client(reader, writer)
+        finally:
+            self.connections.discard(task)
     
-    def handle_client(self, client_socket):
+    async def read(self, reader, timeout):
+        """수신 (시간 초과 시 asyncio.TimeoutError)"""
+        return await asyncio.wait_for(reader.read(4096), timeout)
+    
+    async def handle_client(self, reader, writer):
         """클라이언트 요청 처리"""
+        client = self.client_host(writer)
         try:
-            # 데이터 수신
-            data = b''
-            while True:
-                chunk = client_socket.recv(4096)
+            # 첫 데이터 수신 (프레이밍 협상 확인)
+            data = await self.read(reader, self.read_timeout)
+            while data and len(data) < len(self.FRAMING_HELLO) and self.FRAMING_HELLO.startswith(data):
+                chunk = await self.read(reader, self.read_timeout)
                 if not chunk:
                     break
                 data += chunk
-                if len(chunk) < 4096:
-                    break
+            
+            if data.startswith(self.FRAMING_HELLO):
+                await self.handle_ndjson(reader, writer, data[len(self.FRAMING_HELLO):], client)
+                return
             
             if data:
-                # JSON 파싱
-                json_data = json.loads(data.decode('utf-8'))
+                # JSON 파싱 (여러 TCP 세그먼트로 나뉘어 와도 끝까지 수신)
+                json_data = await self.read_json(reader, data)
                 self.printer.logger.info(f"데이터 수신: {json_data}")  # ← 추가
                 
-                # 인쇄 시작 시그널
-                self.printer.signals.start_printing.emit()
-                
-                # 라벨 인쇄
-                success = self.printer.print_label(json_data)
+                # 인쇄 큐에 등록 후 결과 대기
+                item = await self.dispatch_request(json_data, client)
+                response = item if isinstance(item, str) else await self.wait_response(item)
                 
                 # 응답 전송
-                if success:
-                    response = "001"
-                else:
-                    response = "999"
-                client_socket.sendall(response.encode('utf-8'))
+                writer.write(response.encode('utf-8'))
+                await writer.drain()
                 self.printer.logger.info(f"응답 전송: {response}")  # ← 추가
                 
-                # 인쇄 완료 시그널 (약간의 지연)
-                time.sleep(0.5)
-                self.printer.signals.finish_printing.emit()
-                
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                e = TimeoutError("수신 시간 초과")
             self.printer.logger.error(f"클라이언트 처리 오류: {e}")  # ← 추가
-            error_response = {
-                'status': 'error',
-                'message': str(e),
-                'timestamp': datetime.now().isoformat()
-            }
             try:
-                client_socket.sendall(json.dumps(error_response).encode('utf-8'))
-            except:
+                writer.write(self.error_response(e).encode('utf-8'))
+                await writer.drain()
+            except Exception:
                 pass
         finally:
-            client_socket.close()
+            writer.close()
     
-    def stop(self):
-        """서버 종료"""
-        self.printer.logger.error(f"🛑 서버 종료 중...")  # ← 추가
-        self.running = False
-        if self.server_socket:
-            self.server_socket.close()
-
-
-class TrayIcon:
-    """시스템 트레이 아이콘"""
+    @staticmethod
+    def client_host(writer):
+        """클라이언트 IP 문자열 (프린터 라우팅용, 알 수 없으면 None)"""
+        peer = writer.get_extra_info('peername')
+        return peer[0] if isinstance(peer, tuple) and peer else None
     
-    def __init__(self, server, app):
-        self.server = server
-        self.app = app
-        self.icon = None
+    async def read_json(self, reader, data):
+        """JSON 문서 하나가 완성될 때까지 수신 (단발 모드)"""
+        # 객체/배열이 아니면 더 기다릴 필요 없이 바로 파싱 (오류 응답)
+        start = data.lstrip()[:1]
+        if start and start not in (b'{', b'['):
+            return self.parse_json(data)
+        while True:
+            if data.rstrip()[-1:] in (b'}', b']'):
+                try:
+                    return self.parse_json(data)
+                except ValueError:  # 아직 덜 받음 (UnicodeDecodeError 포함)
+                    pass
+            if len(data) > self.MAX_REQUEST_BYTES:
+                raise ValueError(f"요청이 너무 큽니다 ({len(data)} bytes)")
+            
+            chunk = await self.read(reader, self.read_timeout)
+            if not chunk:
+                # 연결이 닫힘 → 받은 데이터로 최종 파싱 (실패 시 오류)
+                return self.parse_json(data)
+            data += chunk
+    
+    def parse_json(self, data):
+        """요청 바이트 → JSON (파싱 시간 기록)"""
+        with self.printer.metrics.timer('parse'):
+            return json.loads(data.decode('utf-8'))
+    
+    async def handle_ndjson(self, reader, writer, buffer, client=None):
+        """NDJSON 지속 연결 처리 - 요청을 연속으로 받아 들어온 순서대로 응답"""
+        writer.write(self.FRAMING_ACK)
+        await writer.drain()
+        self.printer.logger.info("🔗 NDJSON 지속 연결 모드")
+        
+        # 응답 대기열 (가득 차면 다음 요청 수신을 잠시 멈춤)
+        pending = asyncio.Queue(maxsize=self.max_pipeline)
+        sender = asyncio.ensure_future(self.write_responses(writer, pending))
         
-    def create_image(self):
-        """트레이 아이콘 이미지 생성"""
         try:
-            # img/logo.ico 파일 사용
-            if os.path.exists('img/logo.ico'):
-                image = Image.open('img/logo.ico')
-                # ICO 파일은 여러 크기를 포함할 수 있으므로 적절한 크기로 조정
-                if image.size != (64, 64):
-                    image = image.resize((64, 64), Image.Resampling.LANCZOS)
-                return image
-            else:
-                # 파일이 없으면 기본 아이콘 생성
-                print("⚠️ img/logo.ico 파일을 찾을 수 없습니다. 기본 아이콘을 사용합니다.")
-                return self.create_default_icon()
+            while self.running:
+                while b'\n' in buffer:
+                    line, buffer = buffer.split(b'\n', 1)
+                    if line.strip():
+                        await pending.put(await self.process_line(line, client))
+                
+                if len(buffer) > self.MAX_REQUEST_BYTES:
+                    self.printer.logger.error(f"클라이언트 처리 오류: 요청이 너무 큽니다 ({len(buffer)} bytes)")
+                    break
+                
+                try:
+                    chunk = await self.read(reader, self.idle_timeout)
+                except asyncio.TimeoutError:
+                    self.printer.logger.info("🔗 NDJSON 연결 유휴 시간 초과")
+                    break
+                if not chunk:
+                    break
+                buffer += chunk
+        except asyncio.CancelledError:
+            sender.cancel()
+            raise
+        
+        # 남은 응답을 모두 보낸 뒤 종료
+        await pending.put(None)
+        await sender
+    
+    async def process_line(self, line, client=None):
+        """NDJSON 요청 한 줄 처리 → 응답 대기 항목 (오류면 즉시 응답 문자열)"""
+        try:
+            json_data = self.parse_json(line)
+            self.printer.logger.info(f"데이터 수신: {json_data}")
+            return await self.dispatch_request(json_data, client)
         except Exception as e:
-            print(f"⚠️ 아이콘 로드 오류: {e}. 기본 아이콘을 사용합니다.")
-            return self.create_default_icon()
-
-    def create_default_icon(self):
-        """기본 아이콘 생성 (로고 파일이 없을 때)"""
-        width = 64
-        height = 64
-        image = Image.new('RGB', (width, height), 'white')
-        dc = ImageDraw.Draw(image)
-        
-        # 간단한 프린터 아이콘
-        dc.rectangle([10, 15, 54, 40], fill='#0078D4', outline='black', width=2)
-        dc.rectangle([15, 20, 49, 35], fill='white', outline='black')
-        dc.rectangle([20, 40, 44, 50], fill='white', outline='black', width=1)
-        dc.line([25, 43, 39, 43], fill='green', width=2)
-        dc.line([25, 46, 39, 46], fill='green', width=2)
-        
-        return image
-    
-    def on_quit(self, icon, item):
-        """종료 메뉴"""
-        print("👋 프로그램 종료 중...")
-        self.server.stop()
-        icon.stop()
-        QApplication.quit()
+            self.printer.logger.error(f"클라이언트 처리 오류: {e}")
+            return self.error_response(e)
     
-    def on_status(self, icon, item):
-        """상태 확인"""
-        print("✓ 프린터 상태: 실행 중")
-        print(f"   서버: {self.server.host}:{self.server.port}")
-        print(f"   프린터: {self.server.printer.printer_name}")
-        
-        # 시그널 발생
-        self.app.status_signal.emit()
+    async def write_responses(self, writer, pending):
+        """응답 전송 - 요청 순서대로 결과를 기다려 한 줄씩 전송"""
+        connected = True
+        while True:
+            item = await pending.get()
+            if item is None:
+                break
+            response = item if isinstance(item, str) else await self.wait_response(item)
+            if not connected:
+                continue
+            try:
+                writer.write(response.encode('utf-8') + b'\n')
+                await writer.drain()
+                self.printer.logger.info(f"응답 전송: {response}")
+            except OSError as e:
+                # 클라이언트가 끊겨도 대기열은 끝까지 비움
+                connected = False
+                self.printer.logger.error(f"응답 전송 실패: {e}")
     
-    def run(self):
-        """트레이 아이콘 실행"""
-        menu = (
-            item('상태 확인', self.on_status),
-            item('종료', self.on_quit)
-        )
-        
-        self.icon = pystray.Icon(
-            "bixolon_printer",
-            self.create_image(),
-            "국립소방병원 TAG 발급 프린터\n실행 중...",
-            menu
-        )
+    def request_key(self, json_data, labels):
+        """중복 판별 키 (request_id가 있으면 사용, 없으면 대표 프린터 템플릿 기준 라벨 내용 해시)"""
+        if isinstance(json_data, dict) and json_data.get('request_id'):
+            return f"id:{json_data['request_id']}"
+        template = self.printer.template
+        keys = ''.join(label_key(label, template) if isinstance(label, dict) else repr(label) for label in labels)
+        return hashlib.sha256(keys.encode('utf-8')).hexdigest()
+    
+    def find_duplicate(self, key):
+        """중복 시간 내 같은 요청의 작업 (실패한 작업은 다시 인쇄하도록 제외)"""
+        pending = self.recent_requests.get(key)
+        if pending is None:
+            return None
+        job = pending[0]
+        if job.future.done() and not all(job.future.result()):
+            return None
+        return pending
+    
+    async def dispatch_request(self, json_data, client=None):
+        """요청 처리 → 응답 문자열 또는 인쇄 결과 대기 항목 (작업, 라벨 수, 일괄 여부)
         
-        print("📌 시스템 트레이 아이콘 생성됨")
-        self.icon.run()
-
-class StatusDialog(QDialog):
-    """상태 확인 다이얼로그 - 글래스모피즘 디자인"""
-    
-    def __init__(self, server_info):
-        super().__init__()
-        self.setWindowTitle("프린터 상태")
-        self.setFixedSize(450, 350)
-        self.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint)
-        self.setAttribute(Qt.WA_TranslucentBackground)
-        
-        # 메인 레이아웃
-        main_layout = QVBoxLayout()
-        main_layout.setContentsMargins(0, 0, 0, 0)
-        
-        # 글래스 컨테이너
-        self.glass_container = QLabel()
-        self.glass_container.setFixedSize(450, 350)
-        self.glass_container.setStyleSheet("""
-            QLabel {
-                background: qlineargradient(
-                    x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(0, 0, 0, 0.75),
-                    stop:1 rgba(0, 0, 0, 0.85)
-                );
-                border: 2px solid rgba(242, 98, 29, 0.75);
-                border-radius: 25px;
-            }
-        """)
-        
-        # 컨테이너 내부 레이아웃
-        container_layout = QVBoxLayout(self.glass_container)
-        container_layout.setContentsMargins(30, 30, 30, 30)
-        container_layout.setSpacing(20)
-        
-        # 제목
-        title_label = QLabel("🖨️ 프린터 상태")
-        title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet("""
-            QLabel {
-                color: rgba(255, 255, 255, 1);
-                font-size: 24px;
-                font-weight: bold;
-                background: transparent;
-                border: none;
-            }
-        """)
-        container_layout.addWidget(title_label)
-        
-        # 구분선
-        line = QLabel()
-        line.setFixedHeight(2)
-        line.setStyleSheet("""
-            QLabel {
-                background: rgba(242, 98, 29, 0.5);
-                border: none;
-            }
-        """)
-        container_layout.addWidget(line)
-        
-        # 상태 정보 부분을 이렇게 수정
-        status_text = f"""
-        <div style='color: rgba(255, 255, 255, 0.98); line-height: 1.3;'>
-            <p style='font-size: 16px; margin: 5px 0;'>
-                <b>🟢 상태:</b> 실행 중
-            </p>
-            <p style='font-size: 16px; margin: 5px 0;'>
-                <b>🌐 서버:</b> {server_info['host']}:{server_info['port']}
-            </p>
-            <p style='font-size: 16px; margin: 5px 0;'>
-                <b>🖨️ 프린터:</b> {server_info['printer']}
-            </p>
-            <p style='font-size: 16px; margin: 5px 0;'>
-                <b>📂 로그:</b> logs/ 폴더
-            </p>
-        </div>
+        {"action": "status", "job_id": ...} : 비동기 작업 상태 조회
+        "async": true                        : 접수 후 002 + job_id 응답 (기본은 인쇄 완료까지 대기,
+                                               저널을 쓰면 작업 기록이 커밋된 뒤 응답)
+        "callback": "http://..." / "tcp://..." : 비동기 작업 완료 시 결과 전송 (로컬 호스트만)
         """
+        if isinstance(json_data, dict) and json_data.get('action') == 'status':
+            return json.dumps(self.job_result(json_data.get('job_id')), ensure_ascii=False)
+        
+        asynchronous = isinstance(json_data, dict) and bool(json_data.get('async'))
+        callback = self.parse_callback(json_data.get('callback')) if asynchronous else None
+        
+        pending = await self.submit_request(json_data, client)
+        if isinstance(pending, str):
+            return pending
+        job = pending[0]
+        if not asynchronous or job is None:
+            return pending
+        
+        self.jobs.put(job.id, pending)
+        await self.wait_journaled(job)
+        if callback is not None:
+            request_id = json_data.get('request_id')
+            job.future.add_done_callback(
+                lambda future: self.callbacks.submit(self.send_callback, callback, job.id, request_id)
+            )
+        self.printer.logger.info(f"📨 비동기 접수: {job.id}")
+        return json.dumps({'code': self.RESPONSE_ACCEPTED, 'status': 'accepted', 'job_id': job.id})
+    
+    async def wait_journaled(self, job):
+        """작업 기록이 저널에 커밋될 때까지 대기 (접수 응답 후 서버가 죽어도 재시작 때 재인쇄되도록)"""
+        if job.journaled is None:
+            return
+        try:
+            committed = await asyncio.wait_for(asyncio.wrap_future(job.journaled), self.JOURNAL_TIMEOUT)
+        except asyncio.TimeoutError:
+            committed = False
+        if not committed:
+            self.printer.logger.warning(f"⚠️ 작업 저널 기록 확인 실패 - 재시작 시 복구되지 않을 수 있음: {job.id}")
+    
+    async def submit_request(self, json_data, client=None):
+        """요청을 인쇄 큐에 등록 → (작업, 라벨 수, 일괄 여부)
+        
+        client(클라이언트 IP)는 프린터 풀의 대역별 라우팅에 사용한다.
+        같은 요청이 중복 시간 내에 다시 오면 인쇄하지 않고 이전 작업 결과를 돌려준다
+        (force_reprint가 참이면 무시하고 다시 인쇄).
+        큐가 가득 차 있으면 queue_timeout 동안 자리가 나기를 기다리고 (백프레셔),
+        그래도 가득 차 있으면 작업은 None.
+        프린터가 준비되지 않아 거부되면 997 응답 문자열을 바로 돌려준다.
+        """
+        labels, batch = self.parse_labels(json_data)
+        self.printer.metrics.inc('requests_total')
+        
+        key = None
+        if self.recent_requests is not None:
+            key = self.request_key(json_data, labels)
+            force = isinstance(json_data, dict) and bool(json_data.get('force_reprint'))
+            duplicate = None if force else self.find_duplicate(key)
+            if duplicate is not None:
+                self.printer.metrics.inc('duplicates_total')
+                self.printer.logger.info("♻️ 중복 요청 - 이전 인쇄 결과로 응답")
+                return duplicate
         
-        info_label = QLabel(status_text)
-        info_label.setWordWrap(True)  # 자동 줄바꿈
-        info_label.setTextFormat(Qt.RichText)  # ← 이거 추가!
-        info_label.setStyleSheet("""
-            QLabel {
-                background: transparent;
-                border: none;
-                padding: 10px;
-            }
-        """)
-        container_layout.addWidget(info_label)
-        
-        container_layout.addStretch()
-        
-        # 닫기 버튼
-        close_btn = QPushButton("닫기")
-        close_btn.setFixedHeight(45)
-        close_btn.setCursor(Qt.PointingHandCursor)
-        close_btn.setStyleSheet("""
-            QPushButton {
-                background: rgba(242, 98, 29, 0.2);
-                color: white;
-                border: 2px solid rgba(242, 98, 29, 0.3);
-                border-radius: 10px;
-                font-size: 16px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: rgba(242, 98, 29, 0.6);
-                border: 2px solid rgba(242, 98, 29, 0.5);
-            }
-            QPushButton:pressed {
-                background: rgba(242, 98, 29, 0.7);
-            }
-        """)
-        close_btn.clicked.connect(self.hide)
-        container_layout.addWidget(close_btn)
-        
-        main_layout.addWidget(self.glass_container)
-        self.setLayout(main_layout)
+        try:
+            self.print_queue.check_ready(labels, client)
+            deadline = time.monotonic() + self.queue_timeout
+            while self.print_queue.is_full(labels, client) and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            job = self.print_queue.submit(labels, client)
+        except queue.Full:
+            return None, len(labels), batch
+        except PrinterNotReady:
+            return self.build_response([self.RESPONSE_NOT_READY] * len(labels), batch)
+        
+        pending = (job, len(labels), batch)
+        if key is not None:
+            self.recent_requests.put(key, pending)
+        return pending
+    
+    async def wait_response(self, pending):
+        """인쇄 결과를 기다려 응답 문자열 생성"""
+        job, count, batch = pending
+        if job is None:
+            codes = [self.RESPONSE_QUEUE_FULL] * count
+        else:
+            codes = self.result_codes(await asyncio.wrap_future(job.future))
+        return self.build_response(codes, batch)
+    
+    def result_codes(self, results):
+        """라벨별 성공 여부 → 응답 코드 목록"""
+        return [self.RESPONSE_SUCCESS if success else self.RESPONSE_FAILURE for success in results]
+    
+    def job_result(self, job_id):
+        """비동기 작업 상태 {"job_id", "status": pending/done/failed, "code", "results"(일괄)}
         
-        # 화면 중앙에 배치
-        self.center_on_screen()
+        메모리에 없는 작업(재시작 전 접수)은 저널 기록으로 답한다 (항목별 결과 없음).
+        """
+        pending = self.jobs.get(job_id) if job_id else None
+        if pending is None:
+            status = self.journal.lookup(str(job_id)) if job_id and self.journal is not None else None
+            if status is None:
+                raise ValueError(f"알 수 없는 작업 ID: {job_id}")
+            code = {'pending': self.RESPONSE_ACCEPTED, 'done': self.RESPONSE_SUCCESS}.get(status, self.RESPONSE_FAILURE)
+            return {'job_id': job_id, 'status': status, 'code': code}
+        
+        job, count, batch = pending
+        result = {'job_id': job_id, 'status': 'pending', 'code': self.RESPONSE_ACCEPTED}
+        if job.future.done():
+            codes = self.result_codes(job.future.result())
+            code = self.overall_code(codes)
+            result.update(status='done' if code == self.RESPONSE_SUCCESS else 'failed', code=code)
+            if batch:
+                result['results'] = codes
+        return result
+    
+    def parse_callback(self, url):
+        """완료 콜백 주소 확인 (http://호스트[:포트]/경로 또는 tcp://호스트:포트, 허용된 로컬 호스트만)"""
+        if not url:
+            return None
+        parsed = urllib.parse.urlsplit(str(url))
+        if parsed.scheme not in ('http', 'tcp') or not parsed.hostname or (parsed.scheme == 'tcp' and not parsed.port):
+            raise ValueError(f"지원하지 않는 콜백 주소: {url}")
+        if parsed.hostname not in self.callback_hosts:
+            raise ValueError(f"허용되지 않은 콜백 호스트: {parsed.hostname}")
+        return parsed
+    
+    def send_callback(self, callback, job_id, request_id=None):
+        """작업 완료 결과 전송 (콜백 스레드, 실패 시 callback_retries번 재시도)"""
+        result = self.job_result(job_id)
+        if request_id is not None:
+            result['request_id'] = request_id
+        body = json.dumps(result, ensure_ascii=False).encode('utf-8')
+        
+        for attempt in range(self.callback_retries + 1):
+            try:
+                if callback.scheme == 'http':
+                    request = urllib.request.Request(
+                        callback.geturl(), data=body, method='POST',
+                        headers={'Content-Type': 'application/json; charset=utf-8'}
+                    )
+                    with urllib.request.urlopen(request, timeout=self.callback_timeout):
+                        pass
+                else:
+                    with socket.create_connection((callback.hostname, callback.port), timeout=self.callback_timeout) as sock:
+                        sock.sendall(body + b"\n")
+                self.printer.logger.info(f"📬 완료 콜백 전송: {job_id} → {callback.geturl()}")
+                return
+            except OSError as e:
+                error = e
+                time.sleep(0.5 * (attempt + 1))
+        self.printer.metrics.inc('callback_errors_total')
+        self.printer.logger.error(f"✗ 완료 콜백 전송 실패: {job_id} → {callback.geturl()} ({error})")
+    
+    @staticmethod
+    def error_response(error):
+        """오류 응답 (JSON)"""
+        return json.dumps({
+            'status': 'error',
+            'message': str(error),
+            'timestamp': datetime.now().isoformat()
+        })
+    
+    @staticmethod
+    def parse_labels(json_data):
+        """요청 데이터 → (라벨 목록, 일괄 요청 여부)
+        
+        단건: {"qr_data": ...}
+        일괄: [{...}, {...}] 또는 {"labels": [{...}, {...}]}
+        공통 옵션 (객체 최상위): request_id, force_reprint
+        라벨이 객체가 아니면 큐에 넣기 전에 ValueError
+        """
+        if isinstance(json_data, list):
+            labels, batch = json_data, True
+        elif isinstance(json_data, dict) and isinstance(json_data.get('labels'), list):
+            labels, batch = json_data['labels'], True
+        else:
+            labels, batch = [json_data], False
+        
+        if not labels:
+            raise ValueError("빈 일괄 인쇄 요청")
+        for index, label in enumerate(labels):
+            if not isinstance(label, dict):
+                where = f" ({index + 1}번째)" if batch else ""
+                raise ValueError(f"라벨 데이터는 JSON 객체여야 합니다{where}: {label!r}")
+        return labels, batch
+    
+    def build_response(self, codes, batch):
+        """응답 문자열 (단건: 코드, 일괄: 전체 코드 + 항목별 코드 JSON)"""
+        if not batch:
+            return codes[0]
         
-    def close_dialog(self):
-        """다이얼로그 닫기"""
-        self.hide()
-        self.deleteLater()
+        return json.dumps({'code': self.overall_code(codes), 'results': codes})
     
-    def center_on_screen(self):
-        """화면 중앙에 다이얼로그 배치"""
-        screen = QApplication.desktop().screenGeometry()
-        x = (screen.width() - self.width()) // 2
-        y = (screen.height() - self.height()) // 2
-        self.move(x, y)
+    def overall_code(self, codes):
+        """항목별 코드 → 전체 코드 (모두 성공 / 모두 대기열 가득 참 / 모두 준비 안 됨 / 그 외 실패)"""
+        if all(code == self.RESPONSE_SUCCESS for code in codes):
+            return self.RESPONSE_SUCCESS
+        if all(code == self.RESPONSE_QUEUE_FULL for code in codes):
+            return self.RESPONSE_QUEUE_FULL
+        if all(code == self.RESPONSE_NOT_READY for code in codes):
+            return self.RESPONSE_NOT_READY
+        return self.RESPONSE_FAILURE
+    
+    def stop(self, timeout=None):
+        """서버 종료 (다른 스레드에서 호출, 진행 중인 연결 마무리까지 대기)"""
+        self.printer.logger.error(f"🛑 서버 종료 중...")  # ← 추가
+        self.running = False
+        if self.loop is None or self.stop_event is None:
+            return
+        try:
+            self.loop.call_soon_threadsafe(self.stop_event.set)
+        except RuntimeError:  # 이벤트 루프가 이미 종료됨
+            return
+        self.stopped.wait(self.shutdown_grace + 1.0 if timeout is None else timeout)
 
-class Application(QObject):  # ← QObject 추가!
-    """메인 애플리케이션"""
+
+class ConfigWatcher:
+    """설정 파일 변경 감시 - 수정 시각/크기를 주기적으로 확인해 바뀌면 callback 호출"""
     
-    status_signal = pyqtSignal()  # ← 클래스 변수로!
+    def __init__(self, path, callback, interval=2.0):
+        self.path = path
+        self.callback = callback
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.signature = self.read_signature()
     
-    def __init__(self):
-        super().__init__()  # ← 추가!
-        
+    def read_signature(self):
+        """(수정 시각, 크기) - 파일이 없으면 None"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def start(self):
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name='ConfigWatcher')
+        self.thread.daemon = True
+        self.thread.start()
+    
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            signature = self.read_signature()
+            if signature is None or signature == self.signature:
+                continue
+            self.signature = signature
+            try:
+                self.callback()
+            except Exception as e:
+                logging.getLogger('BixolonPrinter').error(f"✗ 설정 다시 읽기 오류: {e}")
+    
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(5.0)
+
+
+class Application:
+    """메인 애플리케이션 (서버 + 인쇄 파이프라인, 화면은 bixolon_gui가 담당)"""
+    
+    def __init__(self, config_path='conf/config.json', headless=None):
         # 설정 파일 로드
+        self.config_path = config_path
         self.config = self.load_config()
         
-        # Qt 애플리케이션
-        self.app = QApplication(sys.argv)
-        self.app.setQuitOnLastWindowClosed(False)
+        # 헤드리스: 명령행 옵션 > 설정 파일 (service.headless)
+        if headless is None:
+            headless = self.config.get('service', {}).get('headless', False)
+        self.headless = headless
         
-        # 컴포넌트 초기화
-        printer_name = self.config.get('printer', {}).get('name', 'BIXOLON XD5-40d - BPL-Z')
-        self.printer = BixolonLabelPrinter(printer_name, self.config)
+        # 컴포넌트 초기화 (프린터 풀, 첫 번째 프린터가 대표 프린터)
+        self.metrics = Metrics()
+        self.signals = PrintSignals()
+        self.print_queue = self.create_pool()
+        self.printer = self.print_queue.members[0].printer
+        
+        # 프린터 상태 감시 (준비 안 된 프린터로 가는 작업을 바로 거부 / 보류)
+        health_config = self.config.get('health', {})
+        self.health_monitor = None
+        if health_config.get('enabled', True):
+            self.health_monitor = HealthMonitor(
+                self.print_queue,
+                interval=health_config.get('interval', 5.0),
+                policy=health_config.get('policy', 'reject'),
+                hold_timeout=health_config.get('hold_timeout', 60.0)
+            )
         
         server_config = self.config.get('server', {})
         self.server = SocketServer(
             host=server_config.get('host', '127.0.0.1'),
             port=server_config.get('port', 9999),
-            printer=self.printer
+            printer=self.printer,
+            print_queue=self.print_queue,
+            dedup_window=self.config.get('dedup', {}).get('window', 30.0),
+            dedup_max_entries=self.config.get('dedup', {}).get('max_entries', 1000),
+            job_ttl=server_config.get('job_ttl', 3600.0),
+            callback_hosts=server_config.get('callback_hosts', ['127.0.0.1', 'localhost', '::1']),
+            journal=self.journal,
+            **self.server_settings(server_config)
         )
         
-        self.tray = TrayIcon(self.server, self)
-        self.dialog = None
-        
-        # 시그널 연결
-        self.printer.signals.start_printing.connect(self.show_printing_dialog)
-        self.printer.signals.finish_printing.connect(self.hide_printing_dialog)
-        self.printer.signals.update_status.connect(self.update_dialog_status)
-        self.status_signal.connect(self._show_status_dialog)  # ← 상태 시그널
-    
-    def _show_status_dialog(self):
-        """실제 다이얼로그 표시 (메인 스레드)"""
-        server_info = {
-            'host': self.server.host,
-            'port': self.server.port,
-            'printer': self.server.printer.printer_name
-        }
-        dialog = StatusDialog(server_info)
-        dialog.exec_()
+        # 지표 엔드포인트 (/metrics)
+        metrics_config = self.config.get('metrics', {})
+        self.metrics.add_gauge('queue_depth', self.print_queue.depth)
+        if self.journal:
+            self.metrics.add_gauge('journal_replayed', lambda: self.journal.replayed)
+            self.metrics.add_gauge('journal_backlog', self.journal.depth)
+        self.metrics.add_gauge('cache_entries', lambda: sum(
+            member.printer.cache.stats()['entries'] for member in self.print_queue.members
+        ))
+        self.metrics.add_gauge('cache_bytes', lambda: sum(
+            member.printer.cache.stats()['bytes'] for member in self.print_queue.members
+        ))
+        for key in ('depth', 'healthy', 'ready', 'jobs', 'labels_printed', 'labels_failed', 'failovers',
+                    'render_utilization', 'spool_utilization', 'session_opens', 'session_reuses', 'session_stale'):
+            self.metrics.add_gauge(f'printer_{key}', partial(self.print_queue.member_values, key), label='printer')
+        self.metrics_server = None
+        if metrics_config.get('enabled', True):
+            self.metrics_server = MetricsServer(
+                self.metrics,
+                host=metrics_config.get('host', '127.0.0.1'),
+                port=metrics_config.get('port', 9180)
+            )
+        
+        # 설정 파일 변경 감시 (다시 시작하지 않고 반영)
+        reload_config = self.config.get('reload', {})
+        self.reload_lock = threading.Lock()
+        self.config_watcher = None
+        if reload_config.get('enabled', True):
+            self.config_watcher = ConfigWatcher(
+                self.config_path,
+                self.reload_config,
+                interval=reload_config.get('interval', 2.0)
+            )
+        
+        self.stop_event = threading.Event()
+    
+    # 실행 중에 바꿀 수 있는 서버 설정 (기본값)
+    SERVER_SETTINGS = {
+        'read_timeout': 30.0,
+        'idle_timeout': 300.0,
+        'max_pipeline': 32,
+        'max_connections': 64,
+        'queue_timeout': 2.0,
+        'shutdown_grace': 5.0,
+        'callback_timeout': 3.0,
+    }
+    
+    # 다시 시작해야 반영되는 설정 섹션
+    RESTART_SECTIONS = ('service', 'queue', 'render_pool', 'journal', 'dedup', 'metrics', 'logging')
+    
+    def server_settings(self, server_config):
+        return {key: server_config.get(key, default) for key, default in self.SERVER_SETTINGS.items()}
+    
+    def create_pool(self):
+        """설정의 프린터 목록으로 프린터 풀 생성
         
+        printers 항목은 printer 섹션을 기본값으로 덮어쓴다 (목록이 비어 있으면 printer 섹션 하나).
+        """
+        queue_config = self.config.get('queue', {})
+        
+        members = []
+        for member_id, printer_config in self.printer_entries(self.config):
+            printer = self.create_printer(self.config, printer_config)
+            print_queue = PrintQueue(
+                printer,
+                max_size=printer_config.get('queue_size', queue_config.get('max_size', 20)),
+                name=f'PrinterWorker-{member_id}',
+                pipeline_depth=queue_config.get('pipeline_depth', 2)
+            )
+            members.append(PoolMember(member_id, printer, print_queue))
+        
+        # 큰 일괄 작업용 다중 프로세스 생성 (선택)
+        render_config = self.config.get('render_pool', {})
+        self.process_renderer = None
+        if render_config.get('enabled', False):
+            self.process_renderer = ProcessRenderer(
+                {member.id: (member.printer.printer_name, member.printer.config) for member in members},
+                max_workers=render_config.get('workers') or None,
+                min_batch=render_config.get('min_batch', 32),
+                chunk_size=render_config.get('chunk_size', 16)
+            )
+            for member in members:
+                member.printer.process_renderer = (self.process_renderer, member.id)
+        
+        # 작업 저널 (접수 작업 기록 → 재시작 시 미완료 작업 재인쇄)
+        journal_config = self.config.get('journal', {})
+        self.journal = None
+        if journal_config.get('enabled', True):
+            try:
+                self.journal = JobJournal(
+                    journal_config.get('path', 'data/journal.db'),
+                    commit_interval=journal_config.get('commit_interval_ms', 20) / 1000,
+                    max_batch=journal_config.get('max_batch', 256),
+                    retention_hours=journal_config.get('retention_hours', 24)
+                )
+            except (OSError, sqlite3.Error) as e:
+                members[0].printer.logger.error(f"✗ 작업 저널 사용 불가 (기록 없이 계속): {e}")
+        
+        routing = self.config.get('routing', {})
+        return PrinterPool(
+            members,
+            rules=routing.get('rules'),
+            failover=routing.get('failover', True),
+            unhealthy_after=routing.get('unhealthy_after', 1),
+            retry_after=routing.get('retry_after', 30.0),
+            journal=self.journal
+        )
+    
+    @staticmethod
+    def printer_entries(config):
+        """설정의 프린터 목록 → [(프린터 ID, 프린터 설정)] (printers 항목은 printer 섹션을 기본값으로 덮어씀)"""
+        base = config.get('printer', {})
+        entries = []
+        for entry in config.get('printers') or [{}]:
+            printer_config = dict(base, **entry)
+            printer_config.setdefault('name', 'BIXOLON XD5-40d - BPL-Z')
+            entries.append((str(printer_config.get('id', printer_config['name'])), printer_config))
+        return entries
+    
+    def create_printer(self, config, printer_config):
+        """프린터 1대 생성 (지표/시그널은 전체 공유)"""
+        return BixolonLabelPrinter(
+            printer_config['name'],
+            dict(config, printer=printer_config),
+            self.metrics,
+            self.signals
+        )
+    
+    def status_details(self):
+        """상태 다이얼로그에 표시할 처리량/지연 시간 요약"""
+        summary = self.metrics.summary()
+        counters = summary['counters']
+        printed = counters.get('labels_printed_total', 0)
+        failed = counters.get('labels_failed_total', 0)
+        total = summary['stages'].get('total', {})
+        error_rate = failed / (printed + failed) * 100 if printed + failed else 0.0
+        
+        details = [
+            ("📊 인쇄", f"{printed}건 성공 / {failed}건 실패 ({error_rate:.1f}%)"),
+            ("⏱️ 처리 시간", f"p50 {total.get('p50', 0) * 1000:.0f}ms · p95 {total.get('p95', 0) * 1000:.0f}ms · p99 {total.get('p99', 0) * 1000:.0f}ms"),
+            ("📥 대기열", f"{self.print_queue.depth()}건"),
+        ]
+        printers = self.print_queue.stats()['printers']
+        if len(printers) == 1:
+            stats = next(iter(printers.values()))
+            details.append(("⚙️ 가동률", f"생성 {stats['render_utilization'] * 100:.0f}% · 전송 {stats['spool_utilization'] * 100:.0f}%"))
+        if self.process_renderer:
+            render_pool = self.process_renderer.stats()
+            details.append(("⚡ 다중 프로세스 생성", f"작업 프로세스 {render_pool['workers']}개 · {render_pool['batches']}회 {render_pool['labels']}건"))
+        if self.journal:
+            journal = self.journal.stats()
+            details.append(("💾 재시작 복구", f"{journal['replayed']}/{journal['pending_at_start']}건 재인쇄"))
+        if len(printers) > 1:
+            for member_id, stats in printers.items():
+                state = "정상" if stats['healthy'] else "장애"
+                if not stats['ready']:
+                    state = PRINTER_STATE_TEXT.get(stats['state'], state)
+                details.append((f"🖨️ {member_id}", f"{state} · 대기 {stats['depth']}건 · 성공 {stats['labels_printed']} / 실패 {stats['labels_failed']} · 가동률 {stats['render_utilization'] * 100:.0f}/{stats['spool_utilization'] * 100:.0f}%"))
+        if self.metrics_server:
+            details.append(("📈 지표", f"http://{self.metrics_server.host}:{self.metrics_server.port}/metrics"))
+        return details
+    
+    def health_summary(self):
+        """프린터 상태 요약 (상태 감시를 끄면 확인 안 함)"""
+        if self.health_monitor is None:
+            return "확인 안 함"
+        return self.health_monitor.summary()
+    
     def load_config(self):
         """설정 파일 로드"""
         try:
-            with open('conf/config.json', 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return self.read_config()
         except:
             return {}
     
-    def show_printing_dialog(self):
-        """인쇄 다이얼로그 표시"""
-        if self.dialog is None:
-            self.dialog = PrintingDialog()
-        self.dialog.show()
-        self.dialog.update_status("🖨️ 인쇄 중...")
+    def read_config(self):
+        """설정 파일 읽기 + 확인 (잘못된 설정이면 예외)"""
+        with open(self.config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        if not isinstance(config, dict):
+            raise ValueError("설정 파일 최상위는 객체여야 합니다")
+        
+        server_config = config.get('server', {})
+        port = server_config.get('port', 9999)
+        if not isinstance(port, int) or not 0 < port < 65536:
+            raise ValueError(f"잘못된 포트: {port}")
+        for key in self.SERVER_SETTINGS:
+            if not isinstance(server_config.get(key, 0), (int, float)):
+                raise ValueError(f"잘못된 서버 설정: {key}={server_config[key]!r}")
+        if not isinstance(config.get('printers') or [], list):
+            raise ValueError("printers는 목록이어야 합니다")
+        policy = config.get('health', {}).get('policy', 'reject')
+        if policy not in HealthMonitor.POLICIES:
+            raise ValueError(f"지원하지 않는 프린터 상태 정책: {policy}")
+        return config
     
-    def hide_printing_dialog(self):
-        """인쇄 다이얼로그 숨김"""
-        if self.dialog:
-            delay = self.config.get('dialog', {}).get('auto_close_delay', 2000)
-            self.dialog.finish_and_close(delay=delay)
+    def reload_config(self):
+        """설정 파일 변경 반영 (ConfigWatcher 스레드) → 성공 여부
+        
+        새 설정으로 프린터(백엔드/템플릿/폰트/캐시)를 먼저 모두 만들어 본 뒤, 문제가 없을 때만
+        한꺼번에 교체한다. 프린터는 각 큐의 생성 워커가 작업 사이에 바꾸므로 대기 중인 작업은 유지되고,
+        수신 주소가 바뀌면 새 주소로 연결을 받기 시작한 뒤 이전 주소를 닫는다.
+        """
+        with self.reload_lock:
+            logger = self.printer.logger
+            try:
+                config = self.read_config()
+                replaced = self.prepare_printers(config)
+                routing = config.get('routing', {})
+                rules = [self.print_queue.compile_rule(rule) for rule in routing.get('rules') or []]
+            except Exception as e:
+                self.metrics.inc('config_reload_failed_total')
+                logger.error(f"✗ 설정 다시 읽기 실패 - 이전 설정 유지: {e}")
+                return False
+            
+            previous, self.config = self.config, config
+            changes = [key for key in sorted(set(previous) | set(config)) if previous.get(key) != config.get(key)]
+            
+            # 프린터 교체 (생성 워커가 다음 작업 전에 적용)
+            if replaced:
+                if self.process_renderer:
+                    self.process_renderer.reload({
+                        member.id: (replaced.get(member.id, member.printer).printer_name,
+                                    replaced.get(member.id, member.printer).config)
+                        for member in self.print_queue.members
+                    })
+                for member in self.print_queue.members:
+                    printer = replaced.get(member.id)
+                    if printer is None:
+                        continue
+                    if self.process_renderer:
+                        printer.process_renderer = (self.process_renderer, member.id)
+                    member.printer = printer
+                    member.queue.replace_printer(printer)
+                self.printer = self.print_queue.members[0].printer
+                self.server.printer = self.printer
+            
+            # 라우팅 / 상태 감시
+            with self.print_queue.lock:
+                self.print_queue.rules = rules
+                self.print_queue.failover = routing.get('failover', True)
+                self.print_queue.unhealthy_after = max(1, routing.get('unhealthy_after', 1))
+                self.print_queue.retry_after = routing.get('retry_after', 30.0)
+            health_config = config.get('health', {})
+            if self.health_monitor:
+                self.health_monitor.configure(
+                    health_config.get('interval', 5.0),
+                    health_config.get('policy', 'reject'),
+                    health_config.get('hold_timeout', 60.0)
+                )
+            
+            # 서버 설정 + 수신 주소
+            server_config = config.get('server', {})
+            for key, value in self.server_settings(server_config).items():
+                setattr(self.server, key, value)
+            self.server.callback_hosts = set(server_config.get('callback_hosts', ['127.0.0.1', 'localhost', '::1']))
+            address = (server_config.get('host', '127.0.0.1'), server_config.get('port', 9999))
+            rebound = address != (self.server.host, self.server.port)
+            if rebound:
+                try:
+                    self.server.rebind(*address)
+                except Exception as e:
+                    rebound = False
+                    self.metrics.inc('config_reload_failed_total')
+                    logger.error(f"✗ 수신 주소 변경 실패 - {self.server.host}:{self.server.port} 유지: {e}")
+            
+            restart = [key for key in self.RESTART_SECTIONS if key in changes]
+            if bool(health_config.get('enabled', True)) != (self.health_monitor is not None):
+                restart.append('health.enabled')
+            if restart:
+                logger.warning(f"⚠️ 다시 시작해야 반영되는 설정: {', '.join(restart)}")
+            
+            self.metrics.inc('config_reloads_total')
+            summary = [f"변경: {', '.join(changes) or '없음'}"]
+            if replaced:
+                summary.append(f"프린터 교체: {', '.join(replaced)}")
+            if rebound:
+                summary.append(f"수신 주소: {self.server.host}:{self.server.port}")
+            logger.info(f"🔄 설정 다시 읽기 완료 ({' · '.join(summary)})")
+            return True
     
-    def update_dialog_status(self, status):
-        """다이얼로그 상태 업데이트"""
-        if self.dialog:
-            self.dialog.update_status(status)
+    def prepare_printers(self, config):
+        """프린터 설정이 바뀐 구성원만 새 프린터 생성 → {프린터 ID: 새 프린터}
+        
+        프린터 구성(ID 목록)이 바뀌면 큐/워커를 새로 만들어야 하므로 거부한다 (다시 시작 필요).
+        하나라도 만들지 못하면 이미 만든 백엔드를 닫고 예외를 올린다.
+        """
+        entries = self.printer_entries(config)
+        if [member_id for member_id, _ in entries] != [member.id for member in self.print_queue.members]:
+            raise ValueError("프린터 구성(ID 목록) 변경은 다시 시작해야 반영됩니다")
+        
+        replaced = {}
+        try:
+            for member, (member_id, printer_config) in zip(self.print_queue.members, entries):
+                current = member.printer.config
+                if (current.get('printer') == printer_config
+                        and current.get('template') == config.get('template')
+                        and current.get('cache') == config.get('cache')):
+                    continue
+                replaced[member_id] = self.create_printer(config, printer_config)
+        except Exception:
+            for printer in replaced.values():
+                printer.backend.close()
+            raise
+        return replaced
     
-    def run(self):
-        """애플리케이션 실행"""
-        print("=" * 60)
-        print("🖨️  BIXOLON 라벨 프린터 프로그램")
-        print("=" * 60)
+    def start(self):
+        """프린터 워커 / 지표 엔드포인트 / 서버 스레드 시작"""
+        # 다중 프로세스 생성 준비 + 프린터 워커 시작
+        if self.process_renderer:
+            self.process_renderer.start()
+        self.print_queue.start()
+        if self.health_monitor:
+            self.health_monitor.start()
+        if self.config_watcher:
+            self.config_watcher.start()
+        
+        # 작업 저널 기록 시작 + 미완료 작업 재인쇄 (백그라운드)
+        if self.journal:
+            self.journal.start()
+            replay_thread = threading.Thread(target=self.journal.replay, args=(self.print_queue,), name='JournalReplay')
+            replay_thread.daemon = True
+            replay_thread.start()
+        
+        # 지표 엔드포인트 시작
+        if self.metrics_server:
+            try:
+                self.metrics_server.start()
+            except OSError as e:
+                self.printer.logger.error(f"✗ 지표 엔드포인트 시작 실패: {e}")
+                self.metrics_server = None
         
         # 서버 스레드 시작
         server_thread = threading.Thread(target=self.server.start)
         server_thread.daemon = True
         server_thread.start()
+    
+    def shutdown(self):
+        """설정 감시 → 서버 → 상태 감시 → 인쇄 대기열 → 백엔드 → 작업 저널 → 지표 엔드포인트 순서로 종료"""
+        if self.config_watcher:
+            self.config_watcher.stop()
+        self.server.stop()
+        if self.health_monitor:
+            self.health_monitor.stop()
+        if self.journal:
+            self.journal.closing = True  # 이후 중단되는 작업은 미완료로 남겨 다음 시작 때 재인쇄
+        self.print_queue.stop()
+        if self.process_renderer:
+            self.process_renderer.stop()
+        if self.journal:
+            self.journal.close()
+        if self.metrics_server:
+            self.metrics_server.stop()
+        self.stop_event.set()
+    
+    def run_headless(self):
+        """화면 없이 실행 (SIGINT/SIGTERM 또는 Ctrl+C로 종료)"""
+        def request_stop(signum, frame):
+            self.stop_event.set()
         
-        # 트레이 아이콘 스레드 시작
-        tray_thread = threading.Thread(target=self.tray.run)
-        tray_thread.daemon = True
-        tray_thread.start()
+        for name in ('SIGINT', 'SIGTERM', 'SIGBREAK'):
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), request_stop)
         
-        print("✓ 프로그램이 시작되었습니다.")
-        print("✓ 시스템 트레이에서 확인할 수 있습니다.")
-        print("✓ 종료하려면 트레이 아이콘을 우클릭하세요.")
+        print("✓ 헤드리스 모드로 시작되었습니다.")
+        print("✓ 종료하려면 Ctrl+C 또는 SIGTERM을 보내세요.")
+        print("=" * 60)
+        
+        # 짧은 간격으로 대기 (Windows에서도 Ctrl+C가 바로 전달되도록)
+        while not self.stop_event.wait(1.0):
+            pass
+        
+        print("👋 프로그램 종료 중...")
+        self.shutdown()
+        return 0
+    
+    def run(self):
+        """애플리케이션 실행"""
+        print("=" * 60)
+        print("🖨️  BIXOLON 라벨 프린터 프로그램")
         print("=" * 60)
         
-        # Qt 이벤트 루프 실행
-        sys.exit(self.app.exec_())
+        if self.headless:
+            self.start()
+            return self.run_headless()
+        
+        # 화면 모듈은 GUI 모드에서만 로드 (QApplication을 먼저 생성)
+        from bixolon_gui import GuiApplication
+        gui = GuiApplication(self)
+        self.start()
+        return gui.run()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='BIXOLON 라벨 프린터')
+    parser.add_argument('--headless', action='store_true', default=None,
+                        help='트레이/다이얼로그 없이 서버와 인쇄 파이프라인만 실행')
+    parser.add_argument('--config', default='conf/config.json', help='설정 파일 경로')
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    app = Application()
-    app.run()
\ No newline at end of file
+    multiprocessing.freeze_support()  # 실행 파일(PyInstaller)에서 렌더링 작업 프로세스 시작용
+    args = parse_args()
+    app = Application(args.config, headless=args.headless)
+    sys.exit(app.run())
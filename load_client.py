@@ -0,0 +1,204 @@
+"""
+BIXOLON 라벨 프린터 부하 테스트 클라이언트
+여러 클라이언트가 동시에 목표 속도로 인쇄 요청을 보내고 처리량/지연 시간을 측정합니다.
+
+서버는 printer.backend 를 "null"(출력 버림) 또는 "bplz" + sink "file" 로 설정하면
+프린터 없이 전체 경로를 부하 테스트할 수 있습니다.
+
+사용법:
+    python load_client.py --clients 8 --rate 20 --duration 30
+    python load_client.py --clients 4 --requests 200 --mode ndjson
+"""
+
+import argparse
+import json
+import random
+import socket
+import statistics
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from test_client import parse_response
+
+
+SURNAMES = ['김', '이', '박', '최', '정', '강', '조', '윤', '장', '임', '한', '오', '서', '신', '권', '남궁']
+GIVEN_NAMES = ['민준', '서연', '도윤', '하은', '시우', '지유', '윤정', '동원', '길동', '예준', '수아', '지호', '알렉산더']
+DEPARTMENTS = [
+    '싸이버원', '응급의학과', '내과', '외과', '간호부', '원무과', '영상의학과',
+    '재활의학과', '응급의학과 중환자실 간호부 야간 근무조 2팀',
+]
+
+
+def random_label(rng):
+    """실제와 비슷한 임의 라벨 데이터"""
+    number = rng.randint(1, 99999)
+    return {
+        'qr_data': f"Z{number:012d}",
+        'name': rng.choice(SURNAMES) + rng.choice(GIVEN_NAMES),
+        'employee_id': f"Z{number // 10:011d}",
+        'department': rng.choice(DEPARTMENTS),
+        'issue_date': datetime.now().strftime('%Y-%m-%d'),
+    }
+
+
+def random_request(rng, batch):
+    """요청 데이터 (batch > 1이면 일괄 요청), 매번 다시 인쇄하도록 force_reprint 지정"""
+    if batch > 1:
+        return {'labels': [random_label(rng) for _ in range(batch)], 'force_reprint': True}
+    return dict(random_label(rng), force_reprint=True)
+
+
+class LoadClient(threading.Thread):
+    """부하 생성 클라이언트 1개 (목표 간격에 맞춰 요청 전송)"""
+
+    def __init__(self, index, args, interval, deadline, budget, results):
+        super().__init__(daemon=True)
+        self.index = index
+        self.args = args
+        self.interval = interval
+        self.deadline = deadline
+        self.budget = budget      # 남은 요청 수 (공유, 없으면 None)
+        self.results = results    # (지연 시간, 코드) 목록 (공유)
+        self.rng = random.Random(args.seed + index)
+        self.sock = None
+        self.buffer = b''
+
+    def take(self):
+        """요청 예산 1건 차감 (예산 없으면 시간 제한만)"""
+        if self.budget is None:
+            return True
+        with self.budget['lock']:
+            if self.budget['left'] <= 0:
+                return False
+            self.budget['left'] -= 1
+            return True
+
+    def send_legacy(self, request):
+        """단발 모드: 연결 → 요청 → 응답 → 종료"""
+        with socket.create_connection((self.args.host, self.args.port), timeout=self.args.timeout) as sock:
+            sock.sendall(json.dumps(request, ensure_ascii=False).encode('utf-8'))
+            response = b''
+            while True:
+                chunk = sock.recv(4096)
+                if not chunk:
+                    break
+                response += chunk
+        return response.decode('utf-8')
+
+    def send_ndjson(self, request):
+        """NDJSON 지속 연결 모드: 연결을 유지하며 한 줄씩 요청/응답"""
+        if self.sock is None:
+            self.sock = socket.create_connection((self.args.host, self.args.port), timeout=self.args.timeout)
+            self.sock.sendall(b"NDJSON\n")
+            self.buffer = b''
+            if self.read_line() != "NDJSON OK":
+                raise ConnectionError("NDJSON 모드를 지원하지 않는 서버")
+        self.sock.sendall(json.dumps(request, ensure_ascii=False).encode('utf-8') + b"\n")
+        return self.read_line()
+
+    def read_line(self):
+        while b"\n" not in self.buffer:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise ConnectionError("서버가 연결을 닫음")
+            self.buffer += chunk
+        line, self.buffer = self.buffer.split(b"\n", 1)
+        return line.decode('utf-8')
+
+    def run(self):
+        # 클라이언트마다 시작 시점을 분산
+        next_send = time.monotonic() + self.rng.uniform(0, self.interval)
+        while time.monotonic() < self.deadline and self.take():
+            delay = next_send - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            next_send += self.interval
+
+            request = random_request(self.rng, self.args.batch)
+            started = time.monotonic()
+            try:
+                if self.args.mode == 'ndjson':
+                    response = self.send_ndjson(request)
+                else:
+                    response = self.send_legacy(request)
+                code, _ = parse_response(response)
+                code = code or 'invalid'
+            except Exception as e:
+                code = f"error:{type(e).__name__}"
+                if self.sock is not None:
+                    self.sock.close()
+                    self.sock = None
+            self.results.append((time.monotonic() - started, code))
+
+        if self.sock is not None:
+            self.sock.close()
+
+
+def percentile(ordered, q):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def report(results, elapsed, batch):
+    """처리량 / 지연 시간 분위수 출력"""
+    codes = Counter(code for _, code in results)
+    latencies = sorted(latency for latency, _ in results)
+    succeeded = codes.get('001', 0)
+
+    print("-" * 60)
+    print(f"요청 수        : {len(results)} (라벨 {len(results) * batch}장)")
+    print(f"경과 시간      : {elapsed:.2f}s")
+    print(f"처리량         : {len(results) / elapsed:.2f} req/s, 성공 라벨 {succeeded * batch / elapsed:.2f} 장/s")
+    print(f"응답 코드      : {dict(codes)}")
+    if latencies:
+        print(
+            "지연 시간 (ms) : "
+            f"p50 {percentile(latencies, 0.5) * 1000:.1f} · "
+            f"p95 {percentile(latencies, 0.95) * 1000:.1f} · "
+            f"p99 {percentile(latencies, 0.99) * 1000:.1f} · "
+            f"max {latencies[-1] * 1000:.1f} · "
+            f"mean {statistics.mean(latencies) * 1000:.1f}"
+        )
+    print("-" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='BIXOLON 라벨 프린터 부하 테스트')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9999)
+    parser.add_argument('-c', '--clients', type=int, default=4, help='동시 클라이언트 수')
+    parser.add_argument('-r', '--rate', type=float, default=10.0, help='전체 목표 요청 속도 (req/s)')
+    parser.add_argument('-d', '--duration', type=float, default=10.0, help='테스트 시간 (초)')
+    parser.add_argument('-n', '--requests', type=int, default=None, help='총 요청 수 (지정 시 시간보다 우선 종료될 수 있음)')
+    parser.add_argument('--mode', choices=['legacy', 'ndjson'], default='legacy', help='연결 방식')
+    parser.add_argument('--batch', type=int, default=1, help='요청당 라벨 수 (1보다 크면 일괄 요청)')
+    parser.add_argument('--timeout', type=float, default=30.0, help='소켓 시간 제한 (초)')
+    parser.add_argument('--seed', type=int, default=1, help='임의 데이터 시드')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("BIXOLON 라벨 프린터 부하 테스트")
+    print(f"{args.host}:{args.port} · 클라이언트 {args.clients} · 목표 {args.rate} req/s · {args.mode}")
+    print("=" * 60)
+
+    interval = args.clients / args.rate
+    duration = args.duration if args.requests is None else max(args.duration, 3600.0)
+    budget = None if args.requests is None else {'left': args.requests, 'lock': threading.Lock()}
+    results = []
+
+    started = time.monotonic()
+    deadline = started + duration
+    clients = [LoadClient(i, args, interval, deadline, budget, results) for i in range(args.clients)]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+
+    report(results, time.monotonic() - started, args.batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,40 +8,75 @@ import json
 from datetime import datetime
 
 
-def send_print_request(host='127.0.0.1', port=9999):
-    """인쇄 요청 전송"""
-    
+# 서버 응답 코드
+RESPONSE_CODES = {
+    '001': '인쇄 성공',
+    '002': '접수됨 (비동기 - 상태 조회/콜백으로 결과 확인)',
+    '997': '프린터 준비 안 됨 (오프라인 / 라벨 없음 등)',
+    '998': '인쇄 대기열 가득 참',
+    '999': '인쇄 실패',
+}
+
+
+def parse_response(response):
+    """서버 응답 → (코드, 상세)
+
+    단건: "001" / "997" / "998" / "999"
+    일괄: {"code": "001", "results": [...]}
+    오류: {"status": "error", "message": ...}
+    """
+    response = response.strip()
+    if response in RESPONSE_CODES:
+        return response, RESPONSE_CODES[response]
+
+    try:
+        data = json.loads(response)
+    except ValueError:
+        return None, response
+    if isinstance(data, dict) and 'code' in data:
+        return data['code'], data
+    return None, data
+
+
+def send_print_request(host='127.0.0.1', port=9999, print_data=None, timeout=None):
+    """인쇄 요청 전송 → 서버 응답 문자열 (실패 시 None)"""
+
     # 테스트 데이터
-    print_data = {
-        'qr_data': 'T000000001087',
-        'name': '홍길동',
-        'employee_id': 'T00000000108',
-        'department': '싸이버원',
-        'issue_date': '20205-01-01'
-    }
-    
+    if print_data is None:
+        print_data = {
+            'qr_data': 'T000000001087',
+            'name': '홍길동',
+            'employee_id': 'T00000000108',
+            'department': '싸이버원',
+            'issue_date': datetime.now().strftime('%Y-%m-%d')
+        }
+
     try:
         # 소켓 연결
-        client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        client_socket.connect((host, port))
-        
+        client_socket = socket.create_connection((host, port), timeout=timeout)
+
         print(f"서버에 연결됨: {host}:{port}")
         print(f"전송 데이터: {print_data}")
-        
+
         # JSON 데이터 전송
         json_data = json.dumps(print_data, ensure_ascii=False)
         client_socket.sendall(json_data.encode('utf-8'))
-        
-        # 응답 수신
-        response = client_socket.recv(4096)
-        response_data = json.loads(response.decode('utf-8'))
-        
-        print(f"서버 응답: {response_data}")
-        
+
+        # 응답 수신 (서버가 응답 후 연결을 닫음)
+        response = b''
+        while True:
+            chunk = client_socket.recv(4096)
+            if not chunk:
+                break
+            response += chunk
+
         client_socket.close()
-        
-        return response_data
-        
+
+        response = response.decode('utf-8')
+        print(f"서버 응답: {response}")
+
+        return response
+
     except Exception as e:
         print(f"오류 발생: {e}")
         return None
@@ -51,11 +86,12 @@ if __name__ == "__main__":
     print("=" * 50)
     print("BIXOLON 라벨 프린터 테스트 클라이언트")
     print("=" * 50)
-    
+
     # 인쇄 요청 전송
     result = send_print_request()
-    
-    if result and result.get('status') == 'success':
+    code, detail = parse_response(result) if result else (None, None)
+
+    if code == '001':
         print("\n✓ 인쇄 요청이 성공적으로 처리되었습니다!")
     else:
-        print("\n✗ 인쇄 요청 처리에 실패했습니다.")
\ No newline at end of file
+        print(f"\n✗ 인쇄 요청 처리에 실패했습니다. ({code}: {detail})")